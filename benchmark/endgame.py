@@ -0,0 +1,93 @@
+import random
+from time import time
+
+from src.ai import MinimaxGroup2
+from src.ai.endgame import EndgameSolver
+from benchmark.make_unmake import build_state
+from src.utility import is_win, is_full
+
+
+def quiet_state(empty: int, seed: int):
+    """
+    [DESC]
+        Function to play random moves that do not end the game until empty tiles remain
+    [RETURN]
+        State with empty blank tiles, None if every move ends the game before
+    """
+    rng = random.Random(seed)
+    bot = MinimaxGroup2()
+    state = build_state(6, 7, [])
+    while state.board.row * state.board.col - state.board.filled > empty:
+        n_player = (state.round - 1) % 2
+        moves = bot.generatingPossibleMoves(state, n_player)
+        rng.shuffle(moves)
+        for col, shape in moves:
+            state.apply_move(n_player, shape, col)
+            if not is_win(state.board, state.last_move):
+                break
+            state.undo_move()
+        else:
+            return None
+    return state
+
+
+def verify(n_position: int = 10, empty: int = 8, time_limit: float = 5) -> int:
+    """
+    [DESC]
+        Function to check that the solver result of positions with few empty tiles agrees with the
+        result after its move, and that a position without legal moves is a draw with no move
+    [RETURN]
+        int -> number of checked positions
+    """
+    bot = MinimaxGroup2()
+    checked = 0
+    for seed in range(n_position):
+        state = quiet_state(empty, seed)
+        if state is None:
+            continue
+        n_player = (state.round - 1) % 2
+        solver = EndgameSolver(bot, 6, 7)
+        solved = solver.solve(state, n_player, time() + time_limit)
+        if solved is None:
+            continue
+        move, result = solved
+        state.apply_move(n_player, move[1], move[0])
+        if is_win(state.board, state.last_move):
+            assert result == 1, (state.history, result)
+        elif not is_full(state.board):
+            after = EndgameSolver(bot, 6, 7).solve(state, 1 - n_player, time() + time_limit)
+            assert after is None or after[1] == -result, (state.history, result, after)
+        state.undo_move()
+        checked += 1
+
+    state = quiet_state(empty, 0)
+    n_player = (state.round - 1) % 2
+    state.players[n_player].quota = {shape: 0 for shape in state.players[n_player].quota}
+    assert EndgameSolver(bot, 6, 7).solve(state, n_player, time() + time_limit) == (None, 0)
+    return checked + 1
+
+
+def benchmark(n_position: int = 10, time_limit: float = 5):
+    start = time()
+    checked = verify(n_position, time_limit=time_limit)
+    print(f"parity: {checked} positions agree with the result after the solver move ({time() - start:.1f}s)")
+
+    bot = MinimaxGroup2()
+    for empty in [8, 12, 16, 20, 24]:
+        positions, proven, nodes, elapsed = 0, 0, 0, 0.0
+        for seed in range(n_position):
+            state = quiet_state(empty, seed)
+            if state is None:
+                continue
+            positions += 1
+            solver = EndgameSolver(bot, 6, 7)
+            start = time()
+            if solver.solve(state, (state.round - 1) % 2, start + time_limit) is not None:
+                proven += 1
+            elapsed += time() - start
+            nodes += solver.nodes
+        print(f"{empty:>2} empty tiles: {proven}/{positions} proven in {time_limit}s, {nodes} nodes, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,50 @@
+import random
+from time import time
+
+from src.constant import GameConstant
+from src.model import Config
+from src.mechanic import Engine
+
+
+def playout(engine: Engine, rng: random.Random) -> int:
+    """
+    [DESC]
+        Function to play random moves until the game is over
+    [RETURN]
+        int -> number of moves played
+    """
+    moves = 0
+    while engine.result() is None:
+        engine.step(rng.choice(engine.legal_moves()))
+        moves += 1
+    return moves
+
+
+def benchmark(n_game: int = 2000):
+    rng = random.Random(0)
+    for row, col in [(6, 7), (10, 12), (16, 16)]:
+        config = Config(row, col, GameConstant.BVB, None, False, 0)
+        start = time()
+        moves = 0
+        for _ in range(n_game):
+            moves += playout(Engine(config), rng)
+        elapsed = time() - start
+
+        engine = Engine(config)
+        for _ in range(row * col // 2):
+            if engine.result() is not None:
+                break
+            engine.step(rng.choice(engine.legal_moves()))
+        n_clone = 10000
+        clone_start = time()
+        for _ in range(n_clone):
+            engine.clone()
+        clone_time = (time() - clone_start) / n_clone
+        print(
+            f"{row}x{col}: {n_game / elapsed:.0f} random games/s, {elapsed / moves * 1e6:.1f} us/move, "
+            f"clone {clone_time * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,87 @@
+import random
+from time import time
+
+from src.ai import MinimaxGroup2
+from src.ai.evaluation import IncrementalEvaluator
+from benchmark.make_unmake import build_state
+from src.utility import is_win
+
+
+def verify(n_game: int = 200, seed: int = 0, row: int = 6, col: int = 7, streak: int = 4, tolerance: float = 1e-9) -> int:
+    """
+    [DESC]
+        Function to play random games with apply_move / undo_move and check that
+        IncrementalEvaluator gives the same value as calculateValue after every move and undo.
+        IncrementalEvaluator sums exactly and calculateValue adds floats one by one, so values
+        are compared up to tolerance. Raise AssertionError on the first different value
+    [RETURN]
+        int -> number of compared positions
+    """
+    rng = random.Random(seed)
+    bot = MinimaxGroup2()
+    compared = 0
+    for _ in range(n_game):
+        state = build_state(row, col, [], streak)
+        evaluator = IncrementalEvaluator(bot, state)
+        while True:
+            n_player = (state.round - 1) % 2
+            moves = bot.generatingPossibleMoves(state, n_player)
+            if not moves:
+                break
+            move_col, shape = rng.choice(moves)
+            state.apply_move(n_player, shape, move_col)
+            evaluator.apply(state)
+            check(evaluator.value(state), bot.calculateValue(state), tolerance, state)
+            compared += 1
+            if is_win(state.board, state.last_move):
+                break
+
+        while state.history:
+            state.undo_move()
+            evaluator.undo()
+            check(evaluator.value(state), bot.calculateValue(state), tolerance, state)
+            compared += 1
+    return compared
+
+
+def check(value: float, expected: float, tolerance: float, state):
+    if abs(value - expected) > tolerance:
+        raise AssertionError(f"value {value} instead of {expected} after moves {state.history}")
+
+
+def benchmark():
+    start = time()
+    compared = verify()
+    print(f"parity: {compared} positions match calculateValue ({time() - start:.1f}s)")
+    start = time()
+    compared = verify(n_game=20, row=10, col=12, streak=5)
+    print(f"parity on 10x12 connect 5: {compared} positions match calculateValue ({time() - start:.1f}s)")
+
+    bot = MinimaxGroup2()
+    state = build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X"), (5, "O"), (1, "X")])
+    evaluator = IncrementalEvaluator(bot, state)
+    moves = bot.generatingPossibleMoves(state, 0)
+    n = 0
+    start = time()
+    for _ in range(20):
+        for col, shape in moves:
+            state.apply_move(0, shape, col)
+            bot.calculateValue(state)
+            state.undo_move()
+            n += 1
+    full = (time() - start) / n
+
+    start = time()
+    for _ in range(20):
+        for col, shape in moves:
+            state.apply_move(0, shape, col)
+            evaluator.apply(state)
+            evaluator.value(state)
+            state.undo_move()
+            evaluator.undo()
+    incremental = (time() - start) / n
+    print(f"calculateValue: {full * 1e6:.0f} us/eval, incremental apply+value+undo: {incremental * 1e6:.0f} us/eval")
+
+
+if __name__ == "__main__":
+    benchmark()
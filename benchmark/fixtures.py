@@ -0,0 +1,72 @@
+import random
+from typing import Dict
+
+from src.constant import GameConstant
+from src.model import State
+from src.utility import is_win
+from benchmark.make_unmake import build_state
+
+
+# (row, col, number of pieces, seed) of every fixture, pieces are placed by random moves that do
+# not end the game.
+FIXTURES = {
+    "6x7-empty": (6, 7, 0, 0),
+    "6x7-opening": (6, 7, 6, 0),
+    "6x7-midgame": (6, 7, 20, 0),
+    "6x7-near-full": (6, 7, 34, 1),
+    "4x4-midgame": (4, 4, 8, 0),
+    "7x8-midgame": (7, 8, 24, 0),
+    "8x9-midgame": (8, 9, 30, 0),
+}
+
+
+def fixture(name: str) -> State:
+    """
+    [DESC]
+        Function to build a fixture position, the same on every call and every machine
+    [PARAMS]
+        name: str -> key of FIXTURES
+    [RETURN]
+        State with the pieces of the fixture, player to move is (state.round - 1) % 2
+    """
+    return build_fixture(*FIXTURES[name])
+
+
+def build_fixture(row: int, col: int, n_piece: int, seed: int, streak: int = GameConstant.N_COMPONENT_STREAK) -> State:
+    """
+    [DESC]
+        Function to build a position of n_piece pieces placed by random moves that do not end
+        the game, the same for the same arguments
+    [RETURN]
+        State with the pieces, player to move is (state.round - 1) % 2
+    """
+    rng = random.Random(seed)
+    state = build_state(row, col, [], streak)
+    while state.board.filled < n_piece:
+        n_player = (state.round - 1) % 2
+        moves = [
+            (move_col, shape)
+            for move_col in range(col)
+            for shape, quota in sorted(state.players[n_player].quota.items())
+            if quota > 0 and state.board.heights[move_col] < state.board.row
+        ]
+        rng.shuffle(moves)
+        for move_col, shape in moves:
+            state.apply_move(n_player, shape, move_col)
+            if not is_win(state.board, state.last_move):
+                break
+            state.undo_move()
+        else:
+            raise ValueError(f"{row}x{col} fixture cannot reach {n_piece} pieces without a streak")
+    state.history = []
+    return state
+
+
+def fixtures() -> Dict[str, State]:
+    """
+    [DESC]
+        Function to build every fixture position
+    [RETURN]
+        Dict[str, State] -> state of every fixture name
+    """
+    return {name: fixture(name) for name in FIXTURES}
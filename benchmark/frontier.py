@@ -0,0 +1,53 @@
+from time import time
+
+from src.ai import MinimaxGroup2
+from benchmark.make_unmake import build_state
+from benchmark.scaling import quiet_fixture
+
+
+def time_to_depth(bot: MinimaxGroup2, state, n_player: int):
+    """
+    [DESC]
+        Function to search state until bot max_depth
+    [RETURN]
+        Tuple[move, List[float]] -> best move and time in seconds to complete every depth
+    """
+    start = time()
+    times = []
+    move = bot.find(state, n_player, float("inf"), callback=lambda *_: times.append(time() - start))
+    return move, times
+
+
+def benchmark(max_depth: int = 4):
+    """
+    [DESC]
+        Function to compare time to depth and nodes of the NumPy evaluators against the default
+        bot (IncrementalEvaluator), on 6x7 positions and a 10x12 one
+    """
+    positions = {
+        "opening": build_state(6, 7, [(3, "O"), (3, "X")]),
+        "midgame": build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X"), (5, "O"), (1, "X")]),
+        "10x12": quiet_fixture(10, 12, 15),
+    }
+    modes = {
+        "incremental (default)": dict(),
+        "numpy per leaf": dict(use_numpy_eval=True),
+        "numpy batched frontier": dict(use_batched_frontier=True),
+    }
+    for name, state in positions.items():
+        n_player = (state.round - 1) % 2
+        baseline = None
+        for mode, kwargs in modes.items():
+            bot = MinimaxGroup2(max_depth=max_depth, **kwargs)
+            move, times = time_to_depth(bot, state, n_player)
+            if baseline is None:
+                baseline = times[-1]
+            depths = " ".join(f"{t:.2f}" for t in times)
+            print(
+                f"{name:<8} {mode:<23} depth 1-{len(times)} in {depths}s ({times[-1] / baseline:.2f}x time), "
+                f"{bot.nodes} nodes, move {move}"
+            )
+
+
+if __name__ == "__main__":
+    benchmark()
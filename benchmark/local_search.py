@@ -0,0 +1,18 @@
+from src.ai import LocalSearchGroup2
+from benchmark.make_unmake import build_state
+
+
+def benchmark(thinking_time: float = 1):
+    state = build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X"), (5, "O"), (1, "X")])
+    n_player = (state.round - 1) % 2
+    for memoize_successors in [False, True]:
+        bot = LocalSearchGroup2(memoize_successors=memoize_successors)
+        move = bot.find(state, n_player, thinking_time)
+        print(
+            f"memoize successors {'on ' if memoize_successors else 'off'}: {bot.iterations} iterations "
+            f"in {thinking_time}s ({bot.iterations / thinking_time:.0f}/s), move {move}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,86 @@
+import copy
+from time import time
+
+from src.ai import MinimaxGroup2
+from src.constant import GameConstant
+from src.model import Board, Config, Player, State
+from src.utility import place
+
+
+def build_state(row: int, col: int, moves, streak: int = GameConstant.N_COMPONENT_STREAK) -> State:
+    """
+    [DESC]
+        Function to build state from empty board by playing moves alternately
+    [PARAMS]
+        row: int -> num row board
+        col: int -> num column board
+        moves: List[Tuple[int, str]] -> (column, shape) of every move
+        streak: int -> number of connected pieces needed to win
+    [RETURN]
+        State after every move is played
+    """
+    config = Config(row, col, GameConstant.BVB, None, False, 0)
+    players = [
+        Player(GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR, config.quota[0]),
+        Player(GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR, config.quota[1]),
+    ]
+    state = State(Board(row, col, streak), players, 1)
+    for col, shape in moves:
+        place(state, (state.round - 1) % 2, shape, col)
+        state.round += 1
+    return state
+
+
+def walk_copy(bot: MinimaxGroup2, state: State, depth: int, n_player: int) -> int:
+    """
+    [DESC]
+        Full width tree walk generating every child with copy.deepcopy and place,
+        the way search did before apply_move / undo_move
+    [RETURN]
+        int -> number of visited nodes
+    """
+    if depth == 0:
+        return 1
+    nodes = 1
+    for col, shape in bot.generatingPossibleMoves(state, n_player):
+        next_state = copy.deepcopy(state)
+        place(next_state, n_player, shape, col)
+        nodes += walk_copy(bot, next_state, depth - 1, 1 - n_player)
+    return nodes
+
+
+def walk_apply(bot: MinimaxGroup2, state: State, depth: int, n_player: int) -> int:
+    """
+    [DESC]
+        Full width tree walk generating every child in place with apply_move / undo_move
+    [RETURN]
+        int -> number of visited nodes
+    """
+    if depth == 0:
+        return 1
+    nodes = 1
+    for col, shape in bot.generatingPossibleMoves(state, n_player):
+        state.apply_move(n_player, shape, col)
+        nodes += walk_apply(bot, state, depth - 1, 1 - n_player)
+        state.undo_move()
+    return nodes
+
+
+def benchmark(depth: int = 3):
+    bot = MinimaxGroup2(max_depth=3)
+    state = build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X")])
+    n_player = (state.round - 1) % 2
+
+    for name, walk in [("deepcopy + place", walk_copy), ("apply_move / undo_move", walk_apply)]:
+        start = time()
+        nodes = walk(bot, state, depth, n_player)
+        elapsed = time() - start
+        print(f"{name:<24} depth {depth}: {nodes} nodes in {elapsed:.3f}s, {nodes / elapsed:.0f} nodes/s")
+
+    start = time()
+    bot.find(state, n_player, 60)
+    print(f"MinimaxGroup2.find max_depth {bot.max_depth}: {time() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    benchmark()
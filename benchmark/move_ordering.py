@@ -0,0 +1,28 @@
+from time import time
+
+from src.ai import MinimaxGroup2
+from benchmark.make_unmake import build_state
+
+
+def benchmark(max_depth: int = 5):
+    positions = {
+        "opening": build_state(6, 7, [(3, "O"), (3, "X")]),
+        "midgame": build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X"), (5, "O"), (1, "X")]),
+    }
+    for name, state in positions.items():
+        n_player = (state.round - 1) % 2
+        for use_killer_history in [False, True]:
+            bot = MinimaxGroup2(max_depth=max_depth, use_killer_history=use_killer_history)
+            start = time()
+            move = bot.find(state, n_player, float("inf"))
+            elapsed = time() - start
+            report = bot.orderingReport()
+            print(
+                f"{name:<8} killer/history {'on ' if use_killer_history else 'off'} depth {max_depth}: "
+                f"{report['nodes']} nodes, {report['cutoffs']} cutoffs, "
+                f"{report['first_move_cutoff_rate'] * 100:.1f}% on first move, {elapsed:.2f}s, move {move}"
+            )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,37 @@
+import argparse
+import os
+from time import time
+
+from src.ai import MinimaxGroup2
+from benchmark.make_unmake import build_state
+
+
+def benchmark(workers: list, thinking_time: float = 3):
+    positions = {
+        "opening": build_state(6, 7, [(3, "O"), (3, "X")]),
+        "midgame": build_state(6, 7, [(3, "O"), (3, "X"), (2, "O"), (4, "X"), (4, "O"), (2, "X"), (5, "O"), (1, "X")]),
+    }
+    print(f"{os.cpu_count()} cpu, thinking time {thinking_time}s")
+    for name, state in positions.items():
+        n_player = (state.round - 1) % 2
+        for n_worker in workers:
+            bot = MinimaxGroup2(workers=n_worker)
+            # Start worker processes before the clock runs.
+            bot.find(state, n_player, 0.01)
+            depths = []
+            start = time()
+            move = bot.find(state, n_player, thinking_time, callback=lambda depth, move, score: depths.append(depth))
+            elapsed = time() - start
+            bot.close()
+            print(
+                f"{name:<8} {n_worker:>2} workers: depth {depths[-1] if depths else 0}, "
+                f"{bot.nodes} nodes in {elapsed:.2f}s ({bot.nodes / elapsed:.0f} nodes/s), move {move}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--thinking_time", type=float, default=3)
+    args = parser.parse_args()
+    benchmark(args.workers, args.thinking_time)
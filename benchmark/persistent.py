@@ -0,0 +1,88 @@
+import random
+from time import time
+
+from src.ai import MinimaxGroup2
+from benchmark.make_unmake import build_state
+from src.utility import is_win
+
+
+def opening(n_move: int, seed: int):
+    """
+    [DESC]
+        Function to play random moves that do not end the game
+    [RETURN]
+        State after n_move moves, None if every move ends the game before
+    """
+    rng = random.Random(seed)
+    bot = MinimaxGroup2()
+    state = build_state(6, 7, [])
+    for _ in range(n_move):
+        n_player = (state.round - 1) % 2
+        moves = bot.generatingPossibleMoves(state, n_player)
+        rng.shuffle(moves)
+        for col, shape in moves:
+            state.apply_move(n_player, shape, col)
+            if not is_win(state.board, state.last_move):
+                break
+            state.undo_move()
+        else:
+            return None
+    return state
+
+
+def time_to_depth(bot: MinimaxGroup2, state, n_player: int):
+    """
+    [DESC]
+        Function to search state until bot max_depth
+    [RETURN]
+        Tuple[move, List[float]] -> best move and time in seconds to complete every depth
+    """
+    start = time()
+    times = []
+    move = bot.find(state, n_player, float("inf"), callback=lambda *_: times.append(time() - start))
+    return move, times
+
+
+def benchmark(n_position: int = 10, n_move: int = 6, depth: int = 5):
+    """
+    [DESC]
+        Function to search move N, play the best move and the reply predicted by the principal
+        variation, then search move N + 2 with a cold bot and with the bot of move N
+    """
+    totals = {False: [0.0] * depth, True: [0.0] * depth}
+    positions = 0
+    for seed in range(n_position):
+        state = opening(n_move, seed)
+        if state is None:
+            continue
+        n_player = (state.round - 1) % 2
+        warm = MinimaxGroup2(max_depth=depth, opening_book=None, endgame_empty=0, persistent_search=True)
+        move, _ = time_to_depth(warm, state, n_player)
+        if len(warm.pv) < 2:
+            continue
+        reply = warm.pv[1]
+        state.apply_move(n_player, move[1], move[0])
+        state.apply_move(1 - n_player, reply[1], reply[0])
+        if is_win(state.board, state.last_move):
+            continue
+
+        cold = MinimaxGroup2(max_depth=depth, opening_book=None, endgame_empty=0, persistent_search=False)
+        cold_move, cold_times = time_to_depth(cold, state, n_player)
+        warm_move, warm_times = time_to_depth(warm, state, n_player)
+        # Proven results stop the search before depth.
+        if len(cold_times) < depth or len(warm_times) < depth:
+            continue
+        positions += 1
+        for d in range(depth):
+            totals[False][d] += cold_times[d]
+            totals[True][d] += warm_times[d]
+
+    print(f"time to depth on move N + 2, mean of {positions} positions")
+    for d in range(depth):
+        cold_time = totals[False][d] / positions
+        warm_time = totals[True][d] / positions
+        print(f"depth {d + 1}: cold {cold_time * 1000:8.1f} ms, warm {warm_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
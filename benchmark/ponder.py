@@ -0,0 +1,57 @@
+import random
+from time import sleep
+
+from src.ai import MinimaxGroup2
+from benchmark.make_unmake import build_state
+from src.utility import is_win, is_full
+
+
+def play(ponder: bool, thinking_time: float, predictable: float, seed: int):
+    """
+    [DESC]
+        Function to play a game of the bot against an opponent thinking for thinking_time, then
+        playing the reply predicted by the bot with probability predictable or a random move
+    [RETURN]
+        Tuple[List[int], Dict] -> depth reached on every move of the bot and its ponder report
+    """
+    rng = random.Random(seed)
+    bot = MinimaxGroup2(opening_book=None)
+    state = build_state(6, 7, [])
+    depths = []
+    while True:
+        n_player = (state.round - 1) % 2
+        if n_player == 0:
+            reached = []
+            move = bot.find(state, n_player, thinking_time, callback=lambda depth, *_: reached.append(depth))
+            depths.append(reached[-1] if reached else 0)
+            prediction = bot.pv[1] if len(bot.pv) > 1 else None
+        else:
+            sleep(thinking_time)
+            moves = bot.generatingPossibleMoves(state, n_player)
+            move = prediction if prediction in moves and rng.random() < predictable else rng.choice(moves)
+        state.apply_move(n_player, move[1], move[0])
+        if is_win(state.board, state.last_move) or is_full(state.board):
+            break
+        if n_player == 0 and ponder:
+            bot.ponder(state, n_player)
+    bot.stopPondering()
+    return depths, bot.ponderReport()
+
+
+def benchmark(n_game: int = 3, thinking_time: float = 0.5, predictable: float = 0.7):
+    for ponder in (False, True):
+        depths, hits, misses = [], 0, 0
+        for seed in range(n_game):
+            game_depths, report = play(ponder, thinking_time, predictable, seed)
+            depths += game_depths
+            hits += report["hits"]
+            misses += report["misses"]
+        rate = hits / (hits + misses) if hits + misses else 0.0
+        print(
+            f"ponder={ponder}: mean depth {sum(depths) / len(depths):.2f} over {len(depths)} moves, "
+            f"hit rate {rate * 100:.1f}% ({hits}/{hits + misses})"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,54 @@
+import os
+import random
+import tempfile
+from time import time
+
+from src.constant import GameConstant
+from src.model import Config
+from src.mechanic.record import GameRecord, GameRecordWriter, GameRecordReader
+
+
+def random_record(rng: random.Random, row: int = 6, col: int = 7) -> GameRecord:
+    """
+    [DESC]
+        Function to build a record of random moves filling the board
+    """
+    config = Config(row, col, GameConstant.BVB, None, False, 1)
+    record = GameRecord(row, col, config.quota, ["MinimaxGroup2", "LocalSearchGroup2"], 1)
+    heights = [0] * col
+    for _ in range(row * col):
+        move_col = rng.choice([c for c in range(col) if heights[c] < row])
+        heights[move_col] += 1
+        record.add_move(move_col, rng.choice("XO"), rng.random())
+    record.winner = rng.choice([0, 1, None])
+    return record
+
+
+def benchmark(n_game: int = 100000):
+    rng = random.Random(0)
+    records = [random_record(rng) for _ in range(100)]
+    path = os.path.join(tempfile.mkdtemp(), "games.spgr")
+
+    start = time()
+    with GameRecordWriter(path, flush=False) as writer:
+        for i in range(n_game):
+            writer.write(records[i % len(records)])
+    elapsed = time() - start
+    size = os.path.getsize(path)
+    print(f"write: {n_game / elapsed:.0f} games/s, {size / n_game:.1f} bytes/game")
+
+    start = time()
+    moves = 0
+    for record in GameRecordReader(path):
+        moves += len(record.moves)
+    elapsed = time() - start
+    print(f"read: {n_game / elapsed:.0f} games/s, {moves} moves")
+
+    start = time()
+    count = GameRecordReader(path).count()
+    print(f"count: {count} games in {time() - start:.2f}s")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    benchmark()
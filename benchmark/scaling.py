@@ -0,0 +1,136 @@
+import argparse
+from time import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.ai import MinimaxGroup2, LocalSearchGroup2
+from src.ai.evaluation import IncrementalEvaluator
+from src.ai.vectorized import VectorizedEvaluator
+from benchmark.fixtures import build_fixture
+from benchmark.suite import ops_per_sec
+from src.utility import is_win
+
+
+# Row, column and streak of every measured board.
+BOARDS = [(6, 7, 4), (8, 9, 4), (10, 12, 4), (16, 16, 4), (10, 12, 5), (16, 16, 5), (16, 16, 6)]
+
+
+def quiet_fixture(row: int, col: int, n_piece: int, streak: int = 4):
+    """
+    [DESC]
+        Function to build the first fixture of n_piece pieces where the player to move has no
+        winning move, so the search is not cut short by a proven win
+    [RETURN]
+        State of the fixture
+    """
+    seed = 0
+    while True:
+        state = build_fixture(row, col, n_piece, seed, streak)
+        n_player = (state.round - 1) % 2
+        winning = False
+        for move_col, shape in MinimaxGroup2().generatingPossibleMoves(state, n_player):
+            state.apply_move(n_player, shape, move_col)
+            winning = winning or bool(is_win(state.board, state.last_move))
+            state.undo_move()
+        if not winning:
+            state.history = []
+            return state
+        seed += 1
+
+
+def evaluation(state, min_time: float) -> dict:
+    """
+    [DESC]
+        Function to time one evaluation of state with every evaluator of MinimaxGroup2
+    [RETURN]
+        Dict -> microseconds of calculateValue, IncrementalEvaluator apply, value and undo of one
+        move, VectorizedEvaluator on one board and on a batch of 256 boards (None without numpy)
+    """
+    bot = MinimaxGroup2()
+    n_player = (state.round - 1) % 2
+    col, shape = bot.generatingPossibleMoves(state, n_player)[0]
+
+    incremental = IncrementalEvaluator(bot, state)
+
+    def incremental_move():
+        state.apply_move(n_player, shape, col)
+        incremental.apply(state)
+        incremental.value(state)
+        state.undo_move()
+        incremental.undo()
+
+    times = {
+        "calculateValue": 1e6 / ops_per_sec(lambda: bot.calculateValue(state), min_time),
+        "incremental": 1e6 / ops_per_sec(incremental_move, min_time),
+        "numpy": None,
+        "numpy_batch": None,
+    }
+    if np is None:
+        return times
+
+    vectorized = VectorizedEvaluator(bot, state.board.row, state.board.col, state.board.streak)
+    shape_plane, color_plane = vectorized.planes(state.board)
+    batch = 256
+    shapes = np.repeat(shape_plane[None], batch, axis=0)
+    colors = np.repeat(color_plane[None], batch, axis=0)
+    quotas = np.array([vectorized.quota(state)] * batch, dtype=float)
+    times["numpy"] = 1e6 / ops_per_sec(lambda: vectorized.value(state), min_time)
+    times["numpy_batch"] = 1e6 / ops_per_sec(lambda: vectorized.evaluate(shapes, colors, quotas), min_time) / batch
+    return times
+
+
+def search(state, depth: int, thinking_time: float) -> dict:
+    """
+    [DESC]
+        Function to search state with MinimaxGroup2 to depth, without book, endgame solver or
+        state kept between searches, and with LocalSearchGroup2 for thinking_time
+    [RETURN]
+        Dict -> seconds to reach every depth, nodes/sec and local search iterations/sec
+    """
+    n_player = (state.round - 1) % 2
+    bot = MinimaxGroup2(max_depth=depth, opening_book=None, endgame_empty=0, persistent_search=False)
+    times = []
+    start = time()
+    bot.find(state, n_player, float("inf"), callback=lambda *_: times.append(time() - start))
+    elapsed = time() - start
+
+    local = LocalSearchGroup2()
+    start = time()
+    local.find(state, n_player, thinking_time)
+    local_elapsed = time() - start
+    return {
+        "time_to_depth": times,
+        "nodes_per_sec": bot.nodes / elapsed,
+        "iterations_per_sec": local.iterations / local_elapsed,
+    }
+
+
+def benchmark(depth: int = 3, min_time: float = 0.2, thinking_time: float = 0.5):
+    for row, col, streak in BOARDS:
+        # An eighth of the board is filled, random positions fuller than that nearly always
+        # have a winning move on big boards.
+        state = quiet_fixture(row, col, row * col // 8, streak)
+        evaluated = evaluation(state, min_time)
+        searched = search(state, depth, thinking_time)
+        depths = " ".join(f"{t:.2f}" for t in searched["time_to_depth"])
+        numpy = "numpy not installed"
+        if evaluated["numpy"] is not None:
+            numpy = f"numpy {evaluated['numpy']:.0f} us, numpy batch {evaluated['numpy_batch']:.1f} us"
+        print(
+            f"{row}x{col} k={streak}: eval {evaluated['calculateValue']:.0f} us, incremental {evaluated['incremental']:.0f} us, "
+            f"{numpy} | "
+            f"depth 1-{depth} in {depths}s, {searched['nodes_per_sec']:.0f} nodes/s | "
+            f"local search {searched['iterations_per_sec']:.0f} it/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--depth", type=int, default=3, help="max depth of MinimaxGroup2")
+    parser.add_argument("--min_time", type=float, default=0.2, help="minimum seconds of every evaluation measure")
+    parser.add_argument("-tt", "--thinking_time", type=float, default=0.5, help="thinking time of LocalSearchGroup2")
+    args = parser.parse_args()
+    benchmark(args.depth, args.min_time, args.thinking_time)
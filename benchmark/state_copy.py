@@ -0,0 +1,87 @@
+import copy
+import pickle
+import tracemalloc
+from time import time
+
+from src.model import Piece, Player, State
+from src.utility import copy_state
+from benchmark.fixtures import fixture
+
+
+class LegacyPiece:
+    """
+    Class for pieces before Piece was interned, one plain object for every cell of a board
+    """
+
+    def __init__(self, shape: str, color: str):
+        self.shape = shape
+        self.color = color
+
+
+def legacy_state(state: State) -> State:
+    """
+    [DESC]
+        Function to rebuild state with the board representation before piece codes, a list of
+        one LegacyPiece for every cell
+    [RETURN]
+        State with the old board representation
+    """
+    board = copy.copy(state.board)
+    del board.codes
+    board.cells = [LegacyPiece(Piece.SHAPE[code], Piece.COLOR[code]) for code in state.board.codes]
+    legacy = copy.copy(state)
+    legacy.board = board
+    return legacy
+
+
+def legacy_copy_state(state: State) -> State:
+    """
+    [DESC]
+        Function to copy a legacy state like copy_state did, the list of cells is copied
+    """
+    board = copy.copy(state.board)
+    board.cells = list(state.board.cells)
+    players = [Player(player.shape, player.color, dict(player.quota)) for player in state.players]
+    return State(board, players, state.round)
+
+
+def measure(state: State, copy_function, n_copy: int):
+    """
+    [DESC]
+        Function to measure memory of a deep-copied state, deepcopy time, copy time and pickle size
+    [RETURN]
+        Tuple[float, float, float, int] -> bytes/state, deepcopy seconds, copy seconds, pickled bytes
+    """
+    tracemalloc.start()
+    states = [copy.deepcopy(state) for _ in range(1000)]
+    size = tracemalloc.get_traced_memory()[0] / len(states)
+    tracemalloc.stop()
+    del states
+
+    start = time()
+    for _ in range(n_copy):
+        copy.deepcopy(state)
+    deepcopy_time = (time() - start) / n_copy
+
+    start = time()
+    for _ in range(n_copy):
+        copy_function(state)
+    copy_time = (time() - start) / n_copy
+    return size, deepcopy_time, copy_time, len(pickle.dumps(state))
+
+
+def benchmark(n_copy: int = 2000):
+    for name in ["6x7-empty", "6x7-midgame", "8x9-midgame"]:
+        state = fixture(name)
+        old = measure(legacy_state(state), legacy_copy_state, n_copy)
+        new = measure(state, copy_state, n_copy)
+        print(
+            f"{name}: {old[0]:.0f} -> {new[0]:.0f} bytes/state ({old[0] / new[0]:.1f}x), "
+            f"deepcopy {old[1] * 1e6:.1f} -> {new[1] * 1e6:.1f} us ({old[1] / new[1]:.1f}x), "
+            f"copy_state {old[2] * 1e6:.1f} -> {new[2] * 1e6:.1f} us ({old[2] / new[2]:.1f}x), "
+            f"pickle {old[3]} -> {new[3]} bytes"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
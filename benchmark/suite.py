@@ -0,0 +1,217 @@
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from time import time
+from typing import Callable, Dict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from src.ai import MinimaxGroup2, LocalSearchGroup2
+from src.utility import copy_state, is_full, is_win, place
+from benchmark.fixtures import FIXTURES, fixture
+
+
+def ops_per_sec(function: Callable[[], object], min_time: float = 0.2) -> float:
+    """
+    [DESC]
+        Function to call function repeatedly for at least min_time seconds
+    [RETURN]
+        float -> number of calls per second
+    """
+    calls = 0
+    start = time()
+    elapsed = 0.0
+    batch = 1
+    while elapsed < min_time:
+        for _ in range(batch):
+            function()
+        calls += batch
+        batch *= 2
+        elapsed = time() - start
+    return calls / elapsed
+
+
+def place_per_sec(state, n_player: int, min_time: float = 0.2) -> float:
+    """
+    [DESC]
+        Function to time place on copies of state made before timing, one copy per call
+    [RETURN]
+        float -> number of place per second
+    """
+    moves = [(col, shape) for col, shape in MinimaxGroup2().generatingPossibleMoves(state, n_player)]
+    if not moves:
+        return None
+    calls = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        copies = [copy_state(state) for _ in range(1000)]
+        start = time()
+        for i, copy in enumerate(copies):
+            col, shape = moves[i % len(moves)]
+            place(copy, n_player, shape, col)
+        elapsed += time() - start
+        calls += len(copies)
+    return calls / elapsed
+
+
+def primitives(state, min_time: float) -> Dict[str, float]:
+    """
+    [DESC]
+        Function to measure ops/sec of engine primitives and bot helpers on state
+    [RETURN]
+        Dict[str, float] -> ops/sec of every primitive
+    """
+    n_player = (state.round - 1) % 2
+    minimax = MinimaxGroup2()
+    return {
+        "is_win": ops_per_sec(lambda: is_win(state.board), min_time),
+        "is_full": ops_per_sec(lambda: is_full(state.board), min_time),
+        "place": place_per_sec(state, n_player, min_time),
+        "generatingPossibleMoves": ops_per_sec(lambda: minimax.generatingPossibleMoves(state, n_player), min_time),
+        "calculateValue": ops_per_sec(lambda: minimax.calculateValue(state), min_time),
+    }
+
+
+def search(state, depth: int) -> Dict[str, object]:
+    """
+    [DESC]
+        Function to search state with MinimaxGroup2 to depth without book, endgame solver or
+        state kept between searches, then once more under tracemalloc for its peak memory
+    [RETURN]
+        Dict -> nodes, nodes/sec, time to every depth in seconds and peak traced memory in MB
+    """
+    n_player = (state.round - 1) % 2
+    options = {"max_depth": depth, "opening_book": None, "endgame_empty": 0, "persistent_search": False}
+    bot = MinimaxGroup2(**options)
+    times = []
+    start = time()
+    try:
+        bot.find(state, n_player, float("inf"), callback=lambda *_: times.append(time() - start))
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+    elapsed = time() - start
+
+    tracemalloc.start()
+    MinimaxGroup2(**options).find(state, n_player, float("inf"))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "nodes": bot.nodes,
+        "nodes_per_sec": bot.nodes / elapsed if elapsed else None,
+        "time_to_depth": times,
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
+
+
+def local_search(state, thinking_time: float) -> Dict[str, object]:
+    """
+    [DESC]
+        Function to run LocalSearchGroup2 on state for thinking_time
+    [RETURN]
+        Dict -> iterations and iterations/sec over the time find actually took
+    """
+    bot = LocalSearchGroup2()
+    start = time()
+    try:
+        bot.find(state, (state.round - 1) % 2, thinking_time)
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+    elapsed = time() - start
+    return {"iterations": bot.iterations, "iterations_per_sec": bot.iterations / elapsed if elapsed else None}
+
+
+def run(names=None, depth: int = 4, min_time: float = 0.2, thinking_time: float = 0.5) -> Dict[str, object]:
+    """
+    [DESC]
+        Function to run every benchmark on every fixture
+    [PARAMS]
+        names: List[str] -> fixtures to run, every fixture if None
+        depth: int -> max_depth of MinimaxGroup2
+        min_time: float -> minimum time of every primitive measure
+        thinking_time: float -> thinking time of LocalSearchGroup2
+    [RETURN]
+        Dict -> meta (settings and machine) and result of every fixture
+    """
+    results = {}
+    for name in names or FIXTURES:
+        state = fixture(name)
+        results[name] = {
+            "primitives": primitives(state, min_time),
+            "minimax": search(state, depth),
+            "local_search": local_search(state, thinking_time),
+        }
+        print(f"{name} done", file=sys.stderr)
+
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "depth": depth,
+        "min_time": min_time,
+        "thinking_time": thinking_time,
+        "time": time(),
+    }
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        meta["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+    return {"meta": meta, "results": results}
+
+
+def flatten(data, prefix: str = "") -> Dict[str, float]:
+    """
+    [DESC]
+        Function to list every number of a result with its path, like
+        6x7-midgame.minimax.nodes_per_sec
+    """
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return {prefix: data} if isinstance(data, (int, float)) and not isinstance(data, bool) else {}
+    flat = {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(old: Dict[str, object], new: Dict[str, object]):
+    """
+    [DESC]
+        Function to print every number of two runs side by side with the ratio new / old
+    """
+    old_flat = flatten(old["results"])
+    new_flat = flatten(new["results"])
+    for path in sorted(set(old_flat) | set(new_flat)):
+        before = old_flat.get(path)
+        after = new_flat.get(path)
+        ratio = f"{after / before:8.2f}x" if before and after is not None else ""
+        before = f"{before:.6g}" if before is not None else "-"
+        after = f"{after:.6g}" if after is not None else "-"
+        print(f"{path:<60}{before:>14}{after:>14} {ratio}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-f", "--fixtures", nargs="+", choices=list(FIXTURES), help="fixtures to run, every fixture by default")
+    parser.add_argument("-d", "--depth", type=int, default=4, help="max depth of MinimaxGroup2")
+    parser.add_argument("--min_time", type=float, default=0.2, help="minimum seconds of every primitive measure")
+    parser.add_argument("-tt", "--thinking_time", type=float, default=0.5, help="thinking time of LocalSearchGroup2")
+    parser.add_argument("-o", "--output", help="JSON file of the results, printed if not given")
+    parser.add_argument("-c", "--compare", help="JSON file of a previous run to compare with")
+    args = parser.parse_args()
+
+    report = run(args.fixtures, args.depth, args.min_time, args.thinking_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
@@ -0,0 +1,108 @@
+import random
+from time import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.ai import MinimaxGroup2
+from src.ai.vectorized import VectorizedEvaluator
+from benchmark.make_unmake import build_state
+from src.utility import is_win, to_bitboard_state
+
+
+def verify(n_game: int = 100, seed: int = 0, tolerance: float = 1e-9, row: int = 6, col: int = 7, streak: int = 4) -> int:
+    """
+    [DESC]
+        Function to play seeded random games and check that VectorizedEvaluator gives the same
+        value as calculateValue after every move, one board at a time, on BitBoard and as one
+        batch. Raise AssertionError on the first different value
+    [RETURN]
+        int -> number of compared positions
+    """
+    rng = random.Random(seed)
+    bot = MinimaxGroup2()
+    evaluator = VectorizedEvaluator(bot, row, col, streak)
+    compared = 0
+    for _ in range(n_game):
+        state = build_state(row, col, [], streak)
+        expected, shapes, colors, quotas = [], [], [], []
+        while True:
+            n_player = (state.round - 1) % 2
+            moves = bot.generatingPossibleMoves(state, n_player)
+            if not moves:
+                break
+            move_col, shape = rng.choice(moves)
+            state.apply_move(n_player, shape, move_col)
+
+            value = bot.calculateValue(state)
+            check(evaluator.value(state), value, tolerance, state)
+            check(evaluator.value(to_bitboard_state(state)), value, tolerance, state)
+            expected.append(value)
+            shape_plane, color_plane = evaluator.planes(state.board)
+            shapes.append(shape_plane)
+            colors.append(color_plane)
+            quotas.append(evaluator.quota(state))
+            compared += 1
+            if is_win(state.board, state.last_move):
+                break
+
+        values = evaluator.evaluate(np.stack(shapes), np.stack(colors), np.array(quotas, dtype=float))
+        for value, value_expected in zip(values, expected):
+            check(float(value), value_expected, tolerance, state)
+    return compared
+
+
+def check(value: float, expected: float, tolerance: float, state):
+    if abs(value - expected) > tolerance:
+        raise AssertionError(f"value {value} instead of {expected} after moves {state.history}")
+
+
+def benchmark(seed: int = 0):
+    if np is None:
+        print("numpy is not installed, install it with pip install -r requirements-optional.txt")
+        return
+
+    start = time()
+    compared = verify()
+    print(f"parity: {compared} positions match calculateValue ({time() - start:.1f}s)")
+
+    bot = MinimaxGroup2()
+    evaluator = VectorizedEvaluator(bot, 6, 7)
+    rng = random.Random(seed)
+    state = build_state(6, 7, [])
+    for _ in range(21):
+        n_player = (state.round - 1) % 2
+        moves = bot.generatingPossibleMoves(state, n_player)
+        state.apply_move(n_player, *reversed(rng.choice(moves)))
+        if is_win(state.board, state.last_move):
+            state.undo_move()
+
+    n = 20
+    start = time()
+    for _ in range(n):
+        bot.calculateValue(state)
+    python = (time() - start) / n
+
+    start = time()
+    for _ in range(n):
+        evaluator.value(state)
+    single = (time() - start) / n
+
+    shape, color = evaluator.planes(state.board)
+    batch = 256
+    shapes = np.repeat(shape[None], batch, axis=0)
+    colors = np.repeat(color[None], batch, axis=0)
+    quotas = np.array([evaluator.quota(state)] * batch, dtype=float)
+    start = time()
+    evaluator.evaluate(shapes, colors, quotas)
+    batched = (time() - start) / batch
+    print(
+        f"calculateValue {python * 1e6:.0f} us/eval, numpy {single * 1e6:.0f} us/eval, "
+        f"numpy batch of {batch} {batched * 1e6:.1f} us/eval"
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,20 @@
+import argparse
+import os
+from time import time
+
+from src.ai.opening_book import build
+from src.constant import Path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-o", "--output", default=Path.OPENING_BOOK, help="book file")
+    parser.add_argument("-r", "--row", type=int, default=6, help="num row board")
+    parser.add_argument("-c", "--column", type=int, default=7, help="num column board")
+    parser.add_argument("-p", "--plies", type=int, default=8, help="number of moves covered by the book")
+    parser.add_argument("-d", "--depth", type=int, default=6, help="search depth of every position")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of processes")
+    args = parser.parse_args()
+
+    start = time()
+    count = build(args.output, args.row, args.column, args.plies, args.depth, args.workers)
+    print(f"{count} positions written to {args.output} in {time() - start:.1f}s")
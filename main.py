@@ -30,6 +30,21 @@ if __name__ == "__main__":
         required=False,
         help="max bot for thinking",
     )
+    parser.add_argument(
+        "-p",
+        "--ponder",
+        action="store_true",
+        required=False,
+        help="bots keep thinking on the opponent's time",
+    )
+    parser.add_argument("-k", "--streak", required=False, help="connected pieces needed to win, 4 by default")
+    parser.add_argument(
+        "-ob",
+        "--opening_book",
+        required=False,
+        help=f"opening book file of MinimaxGroup2 (built in {Path.OPENING_BOOK} by build_book.py), no book by default",
+    )
+    parser.add_argument("-rec", "--record", required=False, help="game record file the game is appended to")
     parser.add_argument("-b1", "--bot1", required=False, help="filename for bot 1 for pvb or bvb player 1")
     parser.add_argument("-b2", "--bot2", required=False, help="filename for bot 2 for bvb player 2")
 
@@ -42,6 +57,10 @@ if __name__ == "__main__":
     if (row * col) % 2 != 0:
         raise Exception("Row times Col is not even")
 
+    streak = int(args.streak) if args.streak else GameConstant.N_COMPONENT_STREAK
+    if streak < 3 or streak > max(row, col):
+        raise Exception("Streak must be at least 3 and fit in the board")
+
     raw_type = args.type
 
     if raw_type == "bvb":
@@ -69,6 +88,6 @@ if __name__ == "__main__":
         raise Exception("Please Input bvb, pvb, or pvp for --type")
 
     thinking_time = float(args.thinking_time)
-    config = Config(row, col, type, player_choice, is_dump, thinking_time)
+    config = Config(row, col, type, player_choice, is_dump, thinking_time, args.ponder, args.record, streak, args.opening_book)
     game = Game(config)
     game.gameplay()
@@ -0,0 +1,152 @@
+from time import time
+from typing import Dict, List, Tuple
+
+from src.constant import GameConstant
+from src.model import State
+from src.utility import is_win, is_full
+from src.ai.transposition import ZobristHash, TranspositionTable
+
+
+class SolverTimeout(Exception):
+    """
+    Raised inside EndgameSolver when the deadline is reached.
+    """
+
+
+class EndgameSolver:
+    """
+    Class solving a position exactly as win, draw or loss when few empty tiles remain. The search
+    is a negamax alpha-beta on values +1 (player to move wins), 0 (draw) and -1 (player to move
+    loses), so it stops as soon as a result is proven instead of scoring the heuristic.
+
+    Moves are ordered to end the game quickly: moves winning at once first, then moves that do
+    not end the game, then moves giving the streak to the opponent. Every solved position is kept
+    in a cache keyed by zobrist key, kept between find calls since a solved result never changes.
+
+    [ATTRIBUTES]
+        bot: MinimaxGroup2 -> bot generating moves and deciding the winner
+        zobrist: ZobristHash -> keys of the board geometry
+        cache: Dict[int, Tuple[int, int, Tuple[int, str]]] -> (flag, value, move) of solved positions
+        max_entries: int -> cache is cleared when it grows past this size
+        nodes: int -> number of positions visited in the last solve
+    """
+
+    def __init__(self, bot, row: int, col: int, max_entries: int = 1 << 20, streak: int = GameConstant.N_COMPONENT_STREAK):
+        self.bot = bot
+        self.zobrist = ZobristHash(row, col, streak=streak)
+        self.cache: Dict[int, Tuple[int, int, Tuple[int, str]]] = {}
+        self.max_entries = max_entries
+        self.nodes = 0
+
+    def solve(self, state: State, n_player: int, deadline: float) -> Tuple[Tuple[int, str], int]:
+        """
+        [DESC]
+            Function to find the best move and the exact result of the state
+        [PARAMS]
+            state: State -> current state, unchanged when the function returns
+            n_player: int -> player to move
+            deadline: float -> time when solving must stop
+        [RETURN]
+            None if the result is not proven before deadline
+            Tuple[move, result] -> best move and +1 if n_player wins, 0 if draw, -1 if n_player loses.
+            Move is None if n_player has no legal move
+        """
+        self.deadline = deadline
+        self.nodes = 0
+        if len(self.cache) > self.max_entries:
+            self.cache.clear()
+
+        root_ply = len(state.history)
+        key = self.zobrist.hash(state, n_player)
+        try:
+            value = self.negamax(state, n_player, -1, 1, key)
+        except SolverTimeout:
+            while len(state.history) > root_ply:
+                state.undo_move()
+            return None
+        # A state without legal moves is not stored.
+        entry = self.cache.get(key)
+        return (None if entry is None else entry[2], value)
+
+    def orderMoves(self, state: State, n_player: int) -> List[Tuple[Tuple[int, str], int]]:
+        """
+        [DESC]
+            Function to list moves with their immediate result, moves ending the game with a win
+            first and moves giving the win to the opponent last
+        [RETURN]
+            List[Tuple[move, result]] -> result is +1 or -1 if the move ends the game with a win
+            or a loss of n_player, 0 if it fills the board, None if the game goes on
+        """
+        wins, others, losses = [], [], []
+        for move in self.bot.generatingPossibleMoves(state, n_player):
+            state.apply_move(n_player, move[1], move[0])
+            if is_win(state.board, state.last_move):
+                # Objective is positive when player 1 won.
+                player_1_won = self.bot.countObjectiveIsWin(state) > 0
+                if player_1_won == (n_player == 0):
+                    wins.append((move, 1))
+                else:
+                    losses.append((move, -1))
+            elif is_full(state.board):
+                others.append((move, 0))
+            else:
+                others.append((move, None))
+            state.undo_move()
+        return wins + others + losses
+
+    def negamax(self, state: State, n_player: int, alpha: int, beta: int, key: int) -> int:
+        """
+        [DESC]
+            Function to solve the state with alpha-beta, result is seen by the player to move
+        [RETURN]
+            int -> +1 if n_player wins, 0 if draw, -1 if n_player loses, exact when it is
+            strictly between alpha and beta, a bound otherwise
+        """
+        if time() > self.deadline:
+            raise SolverTimeout()
+        self.nodes += 1
+
+        alpha_orig = alpha
+        entry = self.cache.get(key)
+        if entry is not None:
+            flag, value, _ = entry
+            if flag == TranspositionTable.EXACT:
+                return value
+            if flag == TranspositionTable.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        moves = self.orderMoves(state, n_player)
+        if not moves:
+            return 0
+
+        best_value = -2
+        best_move = None
+        for move, result in moves:
+            if result is None:
+                row = state.apply_move(n_player, move[1], move[0])
+                quota = state.players[n_player].quota[move[1]]
+                next_key = key ^ self.zobrist.move_key(row, move[0], n_player, move[1], quota)
+                value = -self.negamax(state, 1 - n_player, -beta, -alpha, next_key)
+                state.undo_move()
+            else:
+                value = result
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif best_value >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.cache[key] = (flag, best_value, best_move)
+        return best_value
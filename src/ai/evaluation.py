@@ -0,0 +1,185 @@
+from typing import List, Tuple
+
+from src.constant import ShapeConstant, GameConstant
+from src.model import State
+from src.utility import is_win, get_window_index
+
+
+class IncrementalEvaluator:
+    """
+    Class keeping the heuristic value of a bot (MinimaxGroup2.calculateValue) up to date while moves
+    are applied and undone, instead of rescanning the whole board on every evaluation.
+
+    The heuristic is a sum over every cell. A non blank cell adds type1 and type2 value of its 4
+    directions (its anchors), a cell without any type1 or type2 value adds type3 value. An anchor
+    only reads cells on its line and the cells right below them (to check if a tile is placeable),
+    so a piece placed at (row, col) can only change the anchors lying on the lines through
+    (row, col) or through (row - 1, col), in the direction of that line. Only those anchors are
+    recomputed, with the bot's own countObjectiveType1 and countObjectiveType2.
+
+    Type1 value also depends on whether player 1 still has its own shape and player 2 still has
+    its own shape. When one of those changes, every anchor is recomputed.
+
+    Every term is a multiple of 0.1 (type1 is an int, type2 a multiple of 0.5, type3 a number of
+    windows / 10), so the sum is kept as an int number of tenths, updated by the difference of
+    every changed term. value is O(1) and the total never drifts however many moves are applied
+    and undone. It is the exact sum, calculateValue adds floats one by one so both can differ by
+    float rounding (less than 1e-9 on any board).
+
+    [ATTRIBUTES]
+        bot: MinimaxGroup2 -> bot owning the heuristic
+        streak: int -> number of connected pieces needed to win on the board
+        terms: List[float] -> for every cell, type1 and type2 of its 4 directions then type3
+        total: int -> sum of every term, in tenths
+        stack: List -> changed terms and total to restore on undo
+    """
+
+    # Same directions as calculateValue: east, north, north east, south east.
+    streak_way = [(0, 1), (-1, 0), (-1, 1), (1, 1)]
+    # Terms of one cell: (type1, type2) for every direction then type3.
+    cell_terms = 2 * len(streak_way) + 1
+
+    def __init__(self, bot, state: State):
+        self.bot = bot
+        self.reset(state)
+
+    def reset(self, state: State):
+        """
+        [DESC]
+            Function to compute every term of the state from scratch
+        [PARAMS]
+            state: State -> current state
+        """
+        board = state.board
+        self.bot.useGeometry(board.row, board.col, board.streak)
+        self.row = board.row
+        self.col = board.col
+        self.streak = board.streak
+        self.lines = self.build_lines(board.row, board.col, board.streak)
+        self.quota_flags = self.get_quota_flags(state)
+        self.terms = [0] * (board.row * board.col * self.cell_terms)
+        self.total = 0
+        self.stack = []
+        for index in range(board.row * board.col):
+            for d in range(len(self.streak_way)):
+                self.update_anchor(state, index, d, [])
+            self.update_type3(index, [])
+
+    def build_lines(self, row: int, col: int, streak: int) -> List[List[List[int]]]:
+        """
+        [DESC]
+            Function to list cells on the line through every cell for every direction
+        [RETURN]
+            List[List[List[int]]] -> lines[direction][cell] is list of cell index on the line
+        """
+        index = get_window_index(row, col, streak)
+        lines = []
+        for direction in self.streak_way:
+            d = index.direction_id[direction]
+            back = index.opposite[d]
+            lines.append([
+                list(reversed(index.ray[cell][back])) + [cell] + list(index.ray[cell][d])
+                for cell in range(row * col)
+            ])
+        return lines
+
+    def get_quota_flags(self, state: State) -> Tuple[bool, bool]:
+        return (
+            state.players[0].quota[GameConstant.PLAYER1_SHAPE] != 0,
+            state.players[1].quota[GameConstant.PLAYER2_SHAPE] != 0,
+        )
+
+    def update_anchor(self, state: State, index: int, d: int, changed: List[Tuple[int, float]]):
+        """
+        [DESC]
+            Function to recompute type1 and type2 of a cell in a direction, and type3 of the cell
+            if needed. Every overwritten term is appended to changed as (position, old term)
+        """
+        row = index // self.col
+        col = index % self.col
+        if state.board[row, col].shape == ShapeConstant.BLANK:
+            type1, type2 = 0, 0
+        else:
+            streak = self.streak_way[d]
+            type1 = self.bot.countObjectiveType1(state, (row, col), streak)
+            type2 = self.bot.countObjectiveType2(state.board, (row, col), streak)
+
+        terms = self.terms
+        base = index * self.cell_terms
+        position = base + 2 * d
+        if terms[position] == type1 and terms[position + 1] == type2:
+            return
+        changed.append((position, terms[position]))
+        changed.append((position + 1, terms[position + 1]))
+        self.total += self.tenths(type1) + self.tenths(type2) - self.tenths(terms[position]) - self.tenths(terms[position + 1])
+        terms[position] = type1
+        terms[position + 1] = type2
+        self.update_type3(index, changed)
+
+    def update_type3(self, index: int, changed: List[Tuple[int, float]]):
+        """
+        [DESC]
+            Function to recompute type3 of a cell, a cell is single horseman if no direction has
+            type1 or type2. Overwritten term is appended to changed as (position, old term)
+        """
+        terms = self.terms
+        base = index * self.cell_terms
+        position = base + self.cell_terms - 1
+        type3 = 0 if any(terms[base:position]) else self.bot.countObjectiveType3(index % self.col)
+        if terms[position] != type3:
+            changed.append((position, terms[position]))
+            self.total += self.tenths(type3) - self.tenths(terms[position])
+            terms[position] = type3
+
+    @staticmethod
+    def tenths(term: float) -> int:
+        return round(term * 10)
+
+    def apply(self, state: State):
+        """
+        [DESC]
+            Function to update terms after state.apply_move
+        [PARAMS]
+            state: State -> state after the move
+        """
+        changed = []
+        self.stack.append((self.quota_flags, changed, self.total))
+
+        quota_flags = self.get_quota_flags(state)
+        if quota_flags != self.quota_flags:
+            self.quota_flags = quota_flags
+            touched = [(index, d) for index in range(self.row * self.col) for d in range(len(self.streak_way))]
+        else:
+            row, col = state.last_move
+            touched = set()
+            for d in range(len(self.streak_way)):
+                touched.update((index, d) for index in self.lines[d][row * self.col + col])
+                if row > 0:
+                    touched.update((index, d) for index in self.lines[d][(row - 1) * self.col + col])
+
+        for index, d in touched:
+            self.update_anchor(state, index, d, changed)
+
+    def undo(self):
+        """
+        [DESC]
+            Function to restore terms after state.undo_move
+        """
+        self.quota_flags, changed, self.total = self.stack.pop()
+        terms = self.terms
+        for position, term in reversed(changed):
+            terms[position] = term
+
+    def value(self, state: State) -> float:
+        """
+        [DESC]
+            Function to get heuristic value of the state, same as bot.calculateValue(state) up to
+            float rounding
+        [PARAMS]
+            state: State -> current state, must be the state the evaluator follows
+        [RETURN]
+            float -> the value of the state
+        """
+        if is_win(state.board, state.last_move):
+            return self.bot.countObjectiveIsWin(state)
+        return self.total / 10
@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import Dict
+
+from src.constant import GameConstant
+
+
+class HeuristicTable:
+    """
+    Class for heuristic values of MinimaxGroup2 and LocalSearchGroup2 that depend on the board
+    geometry. On 6x7 connect 4 the values are the ones the bots were tuned with.
+
+    [ATTRIBUTES]
+        row: int -> boards row shape
+        col: int -> boards column shape
+        streak: int -> number of connected pieces needed to win
+        type2: Dict[str, Dict[int, float]] -> type2 value of a shape or color streak for every
+            number of free placeable tiles possible on the board
+        type3: Dict[int, float] -> type3 value of every column, 0.1 for every horizontal window
+            of streak tiles through the column
+    """
+
+    def __init__(self, row: int, col: int, streak: int = GameConstant.N_COMPONENT_STREAK):
+        self.row = row
+        self.col = col
+        self.streak = streak
+
+        # Two connected pieces leave at most the rest of the longest line free.
+        max_free = max(row, col, 2) - 2
+        self.type2: Dict[str, Dict[int, float]] = {
+            GameConstant.SHAPE: {n: 0 if n < 2 else n - 0.5 for n in range(max_free + 1)},
+            GameConstant.COLOR: {n: 0 if n < 2 else n - 1 for n in range(max_free + 1)},
+        }
+        # Windows through column c start from max(0, c - streak + 1) to min(c, col - streak).
+        self.type3: Dict[int, float] = {
+            c: max(0, min(c, col - streak) - max(0, c - streak + 1) + 1) / 10 for c in range(col)
+        }
+
+
+@lru_cache(maxsize=None)
+def get_heuristic_table(row: int, col: int, streak: int = GameConstant.N_COMPONENT_STREAK) -> HeuristicTable:
+    """
+    [DESC]
+        Function to get heuristic values of a board geometry, built once and cached
+    [PARAMS]
+        row: int -> num row board
+        col: int -> num column board
+        streak: int -> number of connected pieces needed to win
+    [RETURN]
+        HeuristicTable for the geometry
+    """
+    return HeuristicTable(row, col, streak)
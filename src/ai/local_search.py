@@ -1,5 +1,4 @@
 import random
-import copy
 from time import time
 from math import exp
 from typing import Tuple, Dict
@@ -7,6 +6,8 @@ from typing import Tuple, Dict
 from src.constant import *
 from src.model import *
 from src.utility import *
+from src.ai.stats import SearchStats
+from src.ai.heuristic import get_heuristic_table
 
 class LocalSearchGroup2:
     """
@@ -15,10 +16,16 @@ class LocalSearchGroup2:
 
 	[ATTRIBUTES]
 	thinking_time_limit: int -> time when bot must finished searching move.
+	use_bitboard: bool -> search on a BitBoard copy of the state instead of the Board.
+	memoize_successors: bool -> cache value of current state and delta E of successors during find.
+	current_value: float -> value of the state given to find, computed on first use.
+	delta_cache: Dict[Tuple[int, str], float] -> delta E of every successor computed in find.
+	iterations: int -> number of annealing iteration in the last find.
+	stats: SearchStats -> iterations, evaluations and evaluation time of the last find.
 	This class also inherits attribute from AI class (time_limit, used_time).
 	
     [MAIN METHOD]
-	__init__(time_limit:int):
+	__init__(use_bitboard:bool, memoize_successors:bool):
 	    Constructor for SimulatedAnnealing classes, Also construct the base AI class.
 	find(self, state: State, n_player: int) -> Tuple[str, str]:
 	    Find the best move for AI using Simulated Annealing algorithm.
@@ -37,6 +44,8 @@ class LocalSearchGroup2:
             with static heuristic.
         is_placeable(self, board:Board, row:int, col:int ) -> bool:
             Function to check can we place piece at column "col" and row "row".
+        is_placeable_at(self, board:Board, cell:int ) -> bool:
+            Function to check can we place piece at a cell inside the board.
         check_placeable_tiles_at_direction(self, board:Board, start:Tuple[int, int], end:Tuple[int, int], dir:Tuple[int, int]) -> int:
             Function to check number of free placeable tile on direction.
         check_3_streak_split(self, board: Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> Tuple[str, str]:
@@ -49,6 +58,8 @@ class LocalSearchGroup2:
         countObjectiveType3(self, col:int) -> float:
             Function to count heuristic state value if current piece is single horsemen. 
             The heuristic value depend on how many streak is possible.
+        useGeometry(self, row:int, col:int, streak:int):
+            Function to switch type2 and type3 heuristic values to the ones of a board geometry.
         countObjectiveType2(self, board:Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> float:
             Function to count heuristic state value if Type2 exist. Type2 happen where there are 
             two connected piece in some way. The heuristic value depend on free tile on direction.
@@ -65,38 +76,12 @@ class LocalSearchGroup2:
 		"COLOR": 9
 	}
 
-	# Heuristic value for type 2.
-	# Depend on number of free placeable tile.
-    type2Heuristic:Dict[str, Dict[int, int]] = {
-		"SHAPE" : {
-			0:0,
-			1:0,
-			2:1.5,
-			3:2.5,
-			4:3.5,
-			5:4.5
-		},
-		"COLOR": {
-			0:0,
-			1:0,
-			2:1,
-			3:2,
-			4:3,
-			5:4
-		}
-	}
-
-	# Heuristic value for type 3.
-	# Depend on column position
-    type3Heuristic:Dict[int, float] = {
-		0 : 0.1,
-		1 : 0.2,
-		2 : 0.3,
-		3 : 0.4,
-		4 : 0.3,
-		5 : 0.2,
-		6 : 0.1
-	}
+	# Heuristic value for type 2 and type 3 of a 6x7 connect 4 board, useGeometry switches to the values
+	# of the board being searched.
+	# Type 2 depend on number of free placeable tile, type 3 depend on column position.
+    type2Heuristic:Dict[str, Dict[int, float]] = get_heuristic_table(6, 7).type2
+    type3Heuristic:Dict[int, float] = get_heuristic_table(6, 7).type3
+    geometry:Tuple[int, int, int] = (6, 7, GameConstant.N_COMPONENT_STREAK)
     
     def calculateValue(self, state: State) -> float:
         """
@@ -108,8 +93,12 @@ class LocalSearchGroup2:
 		[RETURN]
 			float → the value of the state. 
 		"""        
+		# Heuristic values depend on the board geometry.
+        if ((state.board.row, state.board.col, state.board.streak) != self.geometry):
+            self.useGeometry(state.board.row, state.board.col, state.board.streak)
+
 		# Winning case.
-        if (is_win(state.board)):
+        if (is_win(state.board, state.last_move)):
             return self.countObjectiveIsWin(state)
 
 		# Not Winning case -> checking feature(type) in board.
@@ -154,7 +143,7 @@ class LocalSearchGroup2:
     def countObjectiveType1(self, state:State, location:Tuple[int, int],  dir:Tuple[int, int]) -> float:
         """
         countObjectiveType1 is a function to count heuristic state value if Type1 exist. Type1 happen
-        where there are three connected piece in some way
+        where there are streak-1 connected piece (three on connect 4) in some way
         
         [PARAMS]
             state: State -> gamestate that will be checked.
@@ -167,13 +156,14 @@ class LocalSearchGroup2:
         # Initialize the return value.
         ret_val: int = 0
         # Get the streak.
-        streak = self.check_n_streak_at_direction(3, state.board, location, dir)
+        span = state.board.streak - 1
+        streak = self.check_n_streak_at_direction(span, state.board, location, dir)
         
         # If you get the streak.
         if streak != ["",""]:
             # Get the starting piece and ending piece.
             start = [location[0], location[1]]
-            end = [int(location[0]) + 2*int(dir[0]), int(location[1])+ 2*int(dir[1])]
+            end = [int(location[0]) + (span-1)*int(dir[0]), int(location[1])+ (span-1)*int(dir[1])]
 
             before_start = [start[0] - dir[0], start[1] - dir[1]]
             after_end = [end[0] + dir[0], end[1] + dir[1]]
@@ -183,21 +173,13 @@ class LocalSearchGroup2:
 
             # If able to place in both ends of the streak
             if placeable_start and placeable_end:
-                next_state = copy.deepcopy(state)
-
                 if streak[0] == GameConstant.PLAYER1_SHAPE and state.players[0].quota[GameConstant.PLAYER1_SHAPE] != 0:
-                    place(next_state, 0, streak[0], before_start[1])
                     ret_val += self.type1Heuristic["SHAPE"] * 2
                 elif streak[0] == GameConstant.PLAYER2_SHAPE and state.players[1].quota[GameConstant.PLAYER2_SHAPE] != 0:
-                    place(next_state, 1, streak[0], before_start[1])
                     ret_val -= self.type1Heuristic["SHAPE"] * 2
                 elif streak[1] == GameConstant.PLAYER1_COLOR:
-                    shape = GameConstant.PLAYER1_SHAPE if state.players[0].quota[GameConstant.PLAYER1_SHAPE] > 0 else GameConstant.PLAYER2_SHAPE
-                    place(next_state, 0, shape, before_start[1])
                     ret_val += self.type1Heuristic["COLOR"] * 2
                 elif streak[1] == GameConstant.PLAYER2_COLOR:
-                    shape = GameConstant.PLAYER2_SHAPE if state.players[1].quota[GameConstant.PLAYER2_SHAPE] > 0 else GameConstant.PLAYER1_SHAPE
-                    place(next_state, 1, shape, before_start[1])
                     ret_val -= self.type1Heuristic["COLOR"] * 2
                 return ret_val
 
@@ -223,7 +205,7 @@ class LocalSearchGroup2:
             
             return ret_val
 
-        # No streak with length 3
+        # No streak with length streak-1
         else:
             two_streak = self.check_3_streak_split(state.board, location, dir)
             if two_streak != ["",""]:
@@ -308,6 +290,21 @@ class LocalSearchGroup2:
         """
         return self.type3Heuristic[col]
 
+    def useGeometry(self, row:int, col:int, streak:int = GameConstant.N_COMPONENT_STREAK):
+        """
+        Function to switch type2 and type3 heuristic values to the ones of a board geometry.
+        Values are built once for every geometry and shared between bots.
+
+        [PARAMS]
+            row: int -> num row board
+            col: int -> num column board
+            streak: int -> number of connected pieces needed to win
+        """
+        table = get_heuristic_table(row, col, streak)
+        self.type2Heuristic = table.type2
+        self.type3Heuristic = table.type3
+        self.geometry = (row, col, streak)
+
     def countObjectiveIsWin(self, state: State) -> int:
         """
         [DESC]
@@ -319,7 +316,7 @@ class LocalSearchGroup2:
             +inf if PLayer_1 can win
             -inf if Player_2 can win
         """
-        winner = is_win(state.board)
+        winner = is_win(state.board, state.last_move)
         if winner:
             remainderP1 = 0
             remainderP2 = 0
@@ -362,68 +359,36 @@ class LocalSearchGroup2:
         ret_val = ["",""]
 
         # Get the current piece in specific row and column and mark the 'piece'.
-        row = location[0]
-        col = location[1]
-        piece = board[row, col]
+        codes = board.codes
+        cell = location[0] * board.col + location[1]
+        piece = Piece.BY_CODE[codes[cell]]
         
         # Skip checking if current piece is blank piece. 
         if piece.shape == ShapeConstant.BLANK:
             return None
-        
-        # Check if equal in shape and equal in color.
-        for prior in GameConstant.WIN_PRIOR:
-            # Initialize the streak and get the direction.
-            # If mark-1 = n_streak then you get the streak.
-            mark = 0
-            row_ax = dir[0]
-            col_ax = dir[1]
-            
-            # Move with direction (row_ax, col_ax) one time.
-            row_ = row + row_ax
-            col_ = col + col_ax
-
-            # Move n_streak-1 times until n_streak equal piece (by color or shape) is found or break if
-            # not equal piece found.
-            for _ in range(n_streak - 1):
-                if is_out(board, row_, col_):
-                    mark = 0
-                    break
 
-                # Streak checking.
-                # Checking for shape but current shape not equal with 'piece' shape.
-                shape_condition = (
-                    prior == GameConstant.SHAPE
-                    and piece.shape != board[row_, col_].shape
-                )
-                # Checking for color but current color not equal with  'piece' color.
-                color_condition = (
-                    prior == GameConstant.COLOR
-                    and piece.color != board[row_, col_].color
-                )
-                # Break if not equal.
-                if shape_condition or color_condition:
-                    mark = 0
-                    break
-
-                # Move with direction (row_ax, col_ax) one time and increase the mark.
-                row_ += row_ax
-                col_ += col_ax
-                mark += 1
+        # Get the n_streak-1 next cells with direction (row_ax, col_ax), no streak if they go out
+        # of the board.
+        index = get_window_index(board.row, board.col, board.streak)
+        ray = index.ray[cell][index.direction_id[dir]]
+        if len(ray) < n_streak - 1:
+            return ret_val
+        window = ray[:n_streak - 1]
 
-            # If you get the streak.
-            if mark == n_streak -1:
-                # Change the value of shape or color depending on the iteration.
-                if prior == GameConstant.SHAPE:
-                    ret_val[0] = piece.shape
-                else:
-                    ret_val[1] = piece.color
+        # Check if equal in shape and equal in color.
+        shape_of, color_of = Piece.SHAPE, Piece.COLOR
+        if all(shape_of[codes[i]] == piece.shape for i in window):
+            ret_val[0] = piece.shape
+        if all(color_of[codes[i]] == piece.color for i in window):
+            ret_val[1] = piece.color
 
         # Return the value.
         return ret_val 
 
     def check_3_streak_split(self, board: Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> Tuple[str, str]:
         """
-            Function to check 2 streak followed by blank then the same piece from row, col in current board with specific direction
+            Function to check 2 streak followed by blank then the same piece from row, col in current board with specific direction.
+            On longer streaks, the next streak-1 tiles hold one placeable blank and streak-2 same pieces.
         [PARAMS]
             board: Board -> current board.
             location: Tuple[int, int] -> row and col
@@ -436,39 +401,35 @@ class LocalSearchGroup2:
         ret_val = ["",""]
 
         # Get the current piece in specific row and column and mark the 'piece'.
-        row = location[0]
-        col = location[1]
-        piece = board[row, col]
+        codes = board.codes
+        cell = location[0] * board.col + location[1]
+        piece = Piece.BY_CODE[codes[cell]]
         
         # Skip checking if current piece is blank piece. 
         if piece.shape == ShapeConstant.BLANK:
             return None
+
+        # Get the next streak-1 cells (3 on connect 4) with direction (row_ax, col_ax), no streak if
+        # they go out of the board.
+        span = board.streak - 1
+        index = get_window_index(board.row, board.col, board.streak)
+        ray = index.ray[cell][index.direction_id[dir]]
+        if len(ray) < span:
+            return ret_val
         
         # Check if equal in shape and equal in color.
         for prior in GameConstant.WIN_PRIOR:
-            # Initialize the streak and get the direction.
-            row_ax = dir[0]
-            col_ax = dir[1]
-
             # Count number of blank tiles and streak piece in the direction
             n_blank = 0
             n_piece = 1
-            
-            # Move with direction (row_ax, col_ax) one time.
-            row_ = row + row_ax
-            col_ = col + col_ax
-
-            # Loop 3 times to check the next 3 pieces
-            for _ in range(3):
-                if is_out(board, row_, col_):
-                    n_piece = 1
-                    n_blank = 0
-                    break
 
+            # Loop streak-1 times to check the next streak-1 pieces
+            for i in ray[:span]:
                 # Streak checking.
                 # If blank, incerement n_blank if currnet n_blank = 0 and if placeable
-                if board[row_, col_].shape == ShapeConstant.BLANK:
-                    if self.is_placeable(board, row_, col_) and n_blank == 0:
+                code = codes[i]
+                if code == Piece.BLANK:
+                    if n_blank == 0 and self.is_placeable_at(board, i):
                         n_blank += 1
                     else:
                         n_piece = 1
@@ -479,12 +440,12 @@ class LocalSearchGroup2:
                 else:
                     shape_condition = (
                         prior == GameConstant.SHAPE
-                        and piece.shape != board[row_, col_].shape
+                        and piece.shape != Piece.SHAPE[code]
                     )
                     # Checking for color but current color not equal with  'piece' color.
                     color_condition = (
                         prior == GameConstant.COLOR
-                        and piece.color != board[row_, col_].color
+                        and piece.color != Piece.COLOR[code]
                     )
                     # Break if not equal.
                     if shape_condition or color_condition:
@@ -494,12 +455,8 @@ class LocalSearchGroup2:
 
                     n_piece += 1
 
-                # Move with direction (row_ax, col_ax) one time.
-                row_ += row_ax
-                col_ += col_ax
-
             # If you get the streak.
-            if n_piece == 3 and n_blank == 1:
+            if n_piece == span and n_blank == 1:
                 # Change the value of shape or color depending on the iteration.
                 if prior == GameConstant.SHAPE:
                     ret_val[0] = piece.shape
@@ -524,39 +481,22 @@ class LocalSearchGroup2:
         # Initialize return value.
         ret_val:int = 0
 
-        # Count from start.
-        # Count free tile from start with direction = - dir
-        start_row = start[0]
-        start_col = start[1]
-        start_row_ax = -1 * dir[0]
-        start_col_ax = -1 * dir[1]
-            
-        # Move with direction (row_ax, col_ax) one time.
-        start_row_ = start_row + start_row_ax
-        start_col_ = start_col + start_col_ax
+        index = get_window_index(board.row, board.col, board.streak)
+        direction = index.direction_id[dir]
 
-        # While place_able then loop.
-        while (self.is_placeable(board, start_row_, start_col_)):
+        # Count from start.
+        # Count free tile from start with direction = - dir, while place_able then loop.
+        for i in index.ray[start[0] * board.col + start[1]][index.opposite[direction]]:
+            if not self.is_placeable_at(board, i):
+                break
             ret_val += 1
-            start_row_ = start_row_ + start_row_ax
-            start_col_ = start_col_ + start_col_ax
         
         # Count from end.
-        # Count free tile from end with direction = dir
-        end_row = end[0]
-        end_col = end[1]
-        end_row_ax = dir[0]
-        end_col_ax = dir[1]
-            
-        # Move with direction (row_ax, col_ax) one time.
-        end_row_ = end_row + end_row_ax
-        end_col_ = end_col + end_col_ax
-
-        # While place_able then loop.
-        while (self.is_placeable(board, end_row_, end_col_)):
+        # Count free tile from end with direction = dir, while place_able then loop.
+        for i in index.ray[end[0] * board.col + end[1]][direction]:
+            if not self.is_placeable_at(board, i):
+                break
             ret_val += 1
-            end_row_ = end_row_ + end_row_ax
-            end_col_ = end_col_ + end_col_ax
         
         return ret_val
 
@@ -577,15 +517,22 @@ class LocalSearchGroup2:
         if is_out(board, row, col):
             return False
         
-        # False if current tile is already occupied. 
-        if board[row, col].shape != ShapeConstant.BLANK:
-            return False
+        return self.is_placeable_at(board, row * board.col + col)
+
+    def is_placeable_at(self, board:Board, cell:int ) -> bool:
+        """
+            Function to check can we place piece at a cell inside the board.
 
-        # True if tile under current tile is already occupied, or if current tile at depth zero then 
-        # true.
-        if (row == 5):
-            return True
-        return board[row+1, col].shape != ShapeConstant.BLANK
+        [PARAMS]
+            board : Board -> the game board
+            cell: int -> flat index of the cell, row * board.col + col.
+        
+        [RETURN]
+            bool -> true if you can place piece on the cell, false if not.
+        """
+        # True only for the lowest blank tile of its column, the tile a piece dropped in that
+        # column lands on.
+        return cell // board.col == board.drop_row(cell % board.col)
 
     def generatingPossibleMoves(self, state: State, n_player: int) -> Tuple[int, str]:
         """
@@ -630,7 +577,7 @@ class LocalSearchGroup2:
                         # 	result.append((col, shape))
 
                         # Alternative way
-                        if (state.board[0, col].shape == ShapeConstant.BLANK):
+                        if (state.board.heights[col] < state.board.row):
                             result.append((col, shape))
                     # else:
                     # 	break
@@ -645,7 +592,7 @@ class LocalSearchGroup2:
                         # 	result.append((col, shape))
                         
                         # Alternative way
-                        if (state.board[0, col].shape == ShapeConstant.BLANK):
+                        if (state.board.heights[col] < state.board.row):
                             result.append((col, shape))
                     # else:
                     # 	break
@@ -666,6 +613,22 @@ class LocalSearchGroup2:
         random_number = random.randint(0, len(possible_move)-1)
         return possible_move[random_number]
 
+    def __init__(self, use_bitboard: bool = False, memoize_successors: bool = True) -> None:
+        """
+        Constructor for SimulatedAnnealing class.
+
+        [ATTRIBUTES]
+            use_bitboard: bool -> search on a BitBoard copy of the state instead of the Board.
+            memoize_successors: bool -> compute value of current state once and delta E of every
+                successor once per find.
+        """
+        self.use_bitboard = use_bitboard
+        self.memoize_successors = memoize_successors
+        self.current_value = None
+        self.delta_cache = {}
+        self.iterations = 0
+        self.stats = SearchStats()
+
     def find(self, state: State, n_player: int, thinking_time: float) -> Tuple[str, str]:
         """
         Find is a function to find best move using simulated annealing.
@@ -677,14 +640,28 @@ class LocalSearchGroup2:
         [RETURN]
             Tuple[str, str] -> the best move for current player.
         """
-        self.thinking_time = time() + thinking_time
+        start = time()
+        self.thinking_time = start + thinking_time
         self.time_limit = thinking_time
+        self.stats = SearchStats()
+        if self.use_bitboard:
+            state = to_bitboard_state(state)
+
+        # Current state does not change during the search, neither do its successors.
+        self.current_value = None
+        self.delta_cache = {}
+        self.iterations = 0
+        successors = self.generatingPossibleMoves(state, n_player)
 
         best_movement = ("0", "-")
         found = False
         while(self.calculateTemperature() > 0):
-            successor = self.generateRandomMove(state, n_player)
+            if self.memoize_successors:
+                successor = successors[random.randint(0, len(successors)-1)]
+            else:
+                successor = self.generateRandomMove(state, n_player)
             delta_e = self.calculateDeltaE(state, successor, n_player)
+            self.iterations += 1
             if(delta_e>0):
                 best_movement = successor
                 found = True
@@ -697,8 +674,11 @@ class LocalSearchGroup2:
                     found = True
 
         if(not(found)):
+            self.stats.source = "random"
             best_movement = self.generateRandomMove(state, n_player)
 
+        self.stats.nodes = self.iterations
+        self.stats.total_time = time() - start
         return best_movement
 
     def calculateTemperature(self) -> float:
@@ -723,15 +703,30 @@ class LocalSearchGroup2:
         [RETURN]
             float -> the temperature value of the current time.
         """
-        next_state = copy.deepcopy(state)
-        place(next_state, n_player, move[1], move[0])
+        if self.memoize_successors:
+            if move in self.delta_cache:
+                return self.delta_cache[move]
+        start = time()
+        if self.memoize_successors:
+            if self.current_value is None:
+                self.current_value = self.calculateValue(state)
+                self.stats.leaves += 1
+            curr_value = self.current_value
+        else:
+            curr_value = self.calculateValue(state)
+            self.stats.leaves += 1
 
-        curr_value = self.calculateValue(state)
-        next_value = self.calculateValue(next_state)
+        state.apply_move(n_player, move[1], move[0])
+        next_value = self.calculateValue(state)
+        state.undo_move()
+        self.stats.leaves += 1
+        self.stats.eval_time += time() - start
 
         if (n_player == 1):
             curr_value *= -1
             next_value *= -1
         
+        if self.memoize_successors:
+            self.delta_cache[move] = next_value - curr_value
         return next_value - curr_value
 
@@ -1,11 +1,41 @@
+import multiprocessing
+import os
 import random
-import copy
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
 from time import time
-from typing import Tuple, Dict
+from typing import Callable, Dict, Iterator, List, Tuple
 
 from src.constant import *
 from src.model import *
 from src.utility import *
+from src.ai.transposition import ZobristHash, TranspositionTable
+from src.ai.evaluation import IncrementalEvaluator
+from src.ai.vectorized import VectorizedEvaluator
+from src.ai.opening_book import OpeningBook
+from src.ai.endgame import EndgameSolver
+from src.ai.stats import SearchStats
+from src.ai.heuristic import get_heuristic_table
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside minimax when thinking time is over.
+    """
+
+
+# Bot searching root moves in a worker process of MinimaxGroup2.iterateParallel.
+_root_worker = None
+
+
+def _init_root_worker(options: Dict[str, object], shared_bound) -> None:
+    global _root_worker
+    _root_worker = MinimaxGroup2(**options)
+    _root_worker.shared_bound = shared_bound
+
+
+def _search_root_move(search_id: int, state: State, n_player: int, move: Tuple[int, str], depth: int, deadline: float) -> Tuple[float, bool, int, int, int, int, float]:
+    return _root_worker.searchRootMove(search_id, state, n_player, move, depth, deadline)
 
 
 class MinimaxGroup2:
@@ -19,24 +49,96 @@ class MinimaxGroup2:
 		type3Heuristic : → dictionary for type3 heuristic value.
 	    thingking_time_limit: int -> time when bot must finished searching move.
 	    max_depth: int -> maximum depth for searching.
+	    use_bitboard: bool -> search on a BitBoard copy of the state instead of the Board.
+	    tt: TranspositionTable -> table of searched positions, cleared on every find unless persistent_search
+	        is set, then entries are aged and only cleared when a new game starts.
+	    tt_report: Dict -> hit rate and memory use of the transposition table in the last find.
+	    pv: List[Tuple[int, str]] -> principal variation of the last completed depth.
+	    killers: List[List[Tuple[int, str]]] -> up to two moves causing beta cutoff for every ply.
+	    history: Dict[Tuple[int, str], int] -> history heuristic score of every (column, shape).
+	    root_pieces: int -> number of pieces on the board at the root of the last search.
+	    nodes, leaves, cutoffs, first_move_cutoffs, timeouts: int -> search tree counters of the last find.
+	    eval_time: float -> seconds spent evaluating leaves in the last find.
+	    stats: SearchStats -> counters and time per depth of the last find.
+	    vectorized: VectorizedEvaluator -> NumPy evaluator used when use_numpy_eval is set.
+	    book: OpeningBook -> opened opening book, None if there is none.
+	    solver: EndgameSolver -> exact solver used when at most endgame_empty tiles are empty.
+	    ponder_thread: threading.Thread -> thread searching while the opponent thinks, None if not pondering.
+	    ponder_key: int -> zobrist key of the position searched by the pondering thread.
+	    ponder_results: List -> (depth, move, score) of every depth completed by the pondering thread.
+	    ponder_hits, ponder_misses: int -> number of find on the pondered position or on another one.
+	    workers: int -> number of processes searching root moves, 1 to search in this process.
+	    shared_bound: multiprocessing.Value -> best root score found by any worker in the current depth, only set
+	        on bots of worker processes.
+	    _root_bound: multiprocessing.Value -> the shared bound given to worker processes by the bot that owns them.
 	    This class also inherits attribute from AI class (time_limit, used_time, and max_depth).
 
 	[MAIN METHOD]
-	    __init__(time_limit:int, max_depth:int):
+	    __init__(max_depth:int, use_bitboard:bool, tt_size_mb:float):
 	        Constructor for Minimax classes, Also construct the base AI class.
-	    find(self, state: State, maximizing_player: bool, thinking_time: float) -> Tuple[str, str]:
-	        Find the best move for AI using Minimax Alpha-Beta pruning algorithm.
+	    find(self, state: State, maximizing_player: bool, thinking_time: float, callback: Callable) -> Tuple[str, str]:
+	        Find the best move for AI using iterative deepening Minimax Alpha-Beta pruning algorithm.
+	    iterate(state: State, n_player: int, thinking_time: float) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+	        Iterative deepening search yielding (depth, move, score) of every completed depth.
+	    iterateParallel(state: State, n_player: int, thinking_time: float) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+	        Iterative deepening search with root moves split across worker processes.
+	    searchRootMove(search_id: int, state: State, n_player: int, move: Tuple[int, str], depth: int, deadline: float):
+	        Search one root move in a worker process, sharing the best score with other workers.
+	    deepen(state: State, n_player: int) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+	        Iterative deepening loop of iterate, until the time in thinking_time.
+	    ponder(state: State, n_player: int):
+	        Search the predicted position in a background thread while the opponent thinks.
+	    ponderSearch(state: State, n_player: int):
+	        Body of the pondering thread.
+	    stopPondering(state: State, n_player: int, thinking_time: float, callback: Callable) -> Tuple[int, str]:
+	        Stop pondering, continue the pondering search on a ponder hit.
+	    ponderReport() -> Dict[str, float]:
+	        Ponder hit rate.
+	    bookMove(state: State, n_player: int) -> Tuple[int, str]:
+	        Move of the state in the opening book.
+	    endgameMove(state: State, n_player: int, deadline: float, callback: Callable) -> Tuple[int, str]:
+	        Move proven to win or draw by the endgame solver.
+	    prepareSearch(state: State):
+	        Reset tables, counters and evaluators before a search.
+	    maxSearchDepth(state: State) -> int:
+	        Deepest iteration worth searching.
+	    close():
+	        Shut down worker processes of the parallel search and close the opening book.
+	    principalVariation(state: State, n_player: int, key: int, depth: int) -> List[Tuple[int, str]]:
+	        Expected line of play according to the transposition table.
 	    minimax(possible_move: Tuple[str, str], depth: int, alpha: int, beta: int,  maximizing_player: bool) -> Tuple[str, str]:
 	        Minimax Alpha-Beta Pruning algorithm implementation on every possible move.
+	    prepareTranspositionTable(state: State):
+	        Create zobrist keys and an empty transposition table for the search.
+	    evaluateLeaf(state: State) -> float:
+	        Value of a leaf from the incremental evaluator or calculateValue.
+	    evaluateFrontier(state: State, n_player: int, key: int, possible_moves: List[Tuple[int, str]]) -> List[float]:
+	        Value of the children of a depth 1 node after the first one in one NumPy batch.
+	    orderMoves(possible_moves: List[Tuple[int, str]], state: State, tt_move: Tuple[int, str]) -> List[Tuple[int, str]]:
+	        Order moves with principal variation, transposition table, killer moves and history.
+	    recordCutoff(state: State, move: Tuple[int, str], depth: int, possible_moves: List[Tuple[int, str]]):
+	        Count beta cutoff and update killer moves and history table.
+	    resetCounters():
+	        Reset search counters before a search.
+	    recordStats(source: str, start: float):
+	        Copy search counters of the last find to stats.
+	    orderingReport() -> Dict[str, float]:
+	        Node count and cutoff-on-first-move rate of the last find.
+	    storeResult(key: int, depth: int, selected_move: Tuple[int, str, float], alpha: float, beta: float):
+	        Store search result of a node in the transposition table.
 
 	[BASIC METHOD]
         generateRandomMove(self, state: State, n_player: int) -> Tuple[str, str]:
             Generates a random move based on the current state of the game.
+        randomMoveWithValue(self, state: State, n_player: int) -> Tuple[int, str, float]:
+            Generates a random move and evaluate the state after the move is done.
         generatingPossibleMoves(self, state: State, n_player: int) -> Tuple[int, str]:
             Function to generate possible move that current player can do. The order of the move are optimized 
             with static heuristic.
         is_placeable(self, board:Board, row:int, col:int ) -> bool:
             Function to check can we place piece at column "col" and row "row".
+        is_placeable_at(self, board:Board, cell:int ) -> bool:
+            Function to check can we place piece at a cell inside the board.
         check_placeable_tiles_at_direction(self, board:Board, start:Tuple[int, int], end:Tuple[int, int], dir:Tuple[int, int]) -> int:
             Function to check number of free placeable tile on direction.
         check_3_streak_split(self, board: Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> Tuple[str, str]:
@@ -49,6 +151,8 @@ class MinimaxGroup2:
         countObjectiveType3(self, col:int) -> float:
             Function to count heuristic state value if current piece is single horsemen. 
             The heuristic value depend on how many streak is possible.
+        useGeometry(self, row:int, col:int, streak:int):
+            Function to switch type2 and type3 heuristic values to the ones of a board geometry.
         countObjectiveType2(self, board:Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> float:
             Function to count heuristic state value if Type2 exist. Type2 happen where there are 
             two connected piece in some way. The heuristic value depend on free tile on direction.
@@ -64,38 +168,12 @@ class MinimaxGroup2:
 		"COLOR": 9
 	}
 
-	# Heuristic value for type 2.
-	# Depend on number of free placeable tile.
-    type2Heuristic:Dict[str, Dict[int, int]] = {
-		"SHAPE" : {
-			0:0,
-			1:0,
-			2:1.5,
-			3:2.5,
-			4:3.5,
-			5:4.5
-		},
-		"COLOR": {
-			0:0,
-			1:0,
-			2:1,
-			3:2,
-			4:3,
-			5:4
-		}
-	}
-
-	# Heuristic value for type 3.
-	# Depend on column position
-    type3Heuristic:Dict[int, float] = {
-		0 : 0.1,
-		1 : 0.2,
-		2 : 0.3,
-		3 : 0.4,
-		4 : 0.3,
-		5 : 0.2,
-		6 : 0.1
-	}
+	# Heuristic value for type 2 and type 3 of a 6x7 connect 4 board, useGeometry switches to the values
+	# of the board being searched.
+	# Type 2 depend on number of free placeable tile, type 3 depend on column position.
+    type2Heuristic:Dict[str, Dict[int, float]] = get_heuristic_table(6, 7).type2
+    type3Heuristic:Dict[int, float] = get_heuristic_table(6, 7).type3
+    geometry:Tuple[int, int, int] = (6, 7, GameConstant.N_COMPONENT_STREAK)
 # ==========================================[BASIC METHOD]==========================================
     
     def calculateValue(self, state: State) -> float:
@@ -108,8 +186,12 @@ class MinimaxGroup2:
 		[RETURN]
 			float → the value of the state. 
 		"""        
+		# Heuristic values depend on the board geometry.
+        if ((state.board.row, state.board.col, state.board.streak) != self.geometry):
+            self.useGeometry(state.board.row, state.board.col, state.board.streak)
+
 		# Winning case.
-        if (is_win(state.board)):
+        if (is_win(state.board, state.last_move)):
             return self.countObjectiveIsWin(state)
 
 		# Not Winning case -> checking feature(type) in board.
@@ -154,7 +236,7 @@ class MinimaxGroup2:
     def countObjectiveType1(self, state:State, location:Tuple[int, int],  dir:Tuple[int, int]) -> float:
         """
         countObjectiveType1 is a function to count heuristic state value if Type1 exist. Type1 happen
-        where there are three connected piece in some way
+        where there are streak-1 connected piece (three on connect 4) in some way
         
         [PARAMS]
             state: State -> gamestate that will be checked.
@@ -167,13 +249,14 @@ class MinimaxGroup2:
         # Initialize the return value.
         ret_val: int = 0
         # Get the streak.
-        streak = self.check_n_streak_at_direction(3, state.board, location, dir)
+        span = state.board.streak - 1
+        streak = self.check_n_streak_at_direction(span, state.board, location, dir)
         
         # If you get the streak.
         if streak != ["",""]:
             # Get the starting piece and ending piece.
             start = [location[0], location[1]]
-            end = [int(location[0]) + 2*int(dir[0]), int(location[1])+ 2*int(dir[1])]
+            end = [int(location[0]) + (span-1)*int(dir[0]), int(location[1])+ (span-1)*int(dir[1])]
 
             before_start = [start[0] - dir[0], start[1] - dir[1]]
             after_end = [end[0] + dir[0], end[1] + dir[1]]
@@ -183,21 +266,13 @@ class MinimaxGroup2:
 
             # If able to place in both ends of the streak
             if placeable_start and placeable_end:
-                next_state = copy.deepcopy(state)
-
                 if streak[0] == GameConstant.PLAYER1_SHAPE and state.players[0].quota[GameConstant.PLAYER1_SHAPE] != 0:
-                    place(next_state, 0, streak[0], before_start[1])
                     ret_val += self.type1Heuristic["SHAPE"] * 2
                 elif streak[0] == GameConstant.PLAYER2_SHAPE and state.players[1].quota[GameConstant.PLAYER2_SHAPE] != 0:
-                    place(next_state, 1, streak[0], before_start[1])
                     ret_val -= self.type1Heuristic["SHAPE"] * 2
                 elif streak[1] == GameConstant.PLAYER1_COLOR:
-                    shape = GameConstant.PLAYER1_SHAPE if state.players[0].quota[GameConstant.PLAYER1_SHAPE] > 0 else GameConstant.PLAYER2_SHAPE
-                    place(next_state, 0, shape, before_start[1])
                     ret_val += self.type1Heuristic["COLOR"] * 2
                 elif streak[1] == GameConstant.PLAYER2_COLOR:
-                    shape = GameConstant.PLAYER2_SHAPE if state.players[1].quota[GameConstant.PLAYER2_SHAPE] > 0 else GameConstant.PLAYER1_SHAPE
-                    place(next_state, 1, shape, before_start[1])
                     ret_val -= self.type1Heuristic["COLOR"] * 2
                 return ret_val
 
@@ -223,7 +298,7 @@ class MinimaxGroup2:
             
             return ret_val
 
-        # No streak with length 3
+        # No streak with length streak-1
         else:
             two_streak = self.check_3_streak_split(state.board, location, dir)
             if two_streak != ["",""]:
@@ -308,6 +383,21 @@ class MinimaxGroup2:
         """
         return self.type3Heuristic[col]
 
+    def useGeometry(self, row:int, col:int, streak:int = GameConstant.N_COMPONENT_STREAK):
+        """
+        Function to switch type2 and type3 heuristic values to the ones of a board geometry.
+        Values are built once for every geometry and shared between bots.
+
+        [PARAMS]
+            row: int -> num row board
+            col: int -> num column board
+            streak: int -> number of connected pieces needed to win
+        """
+        table = get_heuristic_table(row, col, streak)
+        self.type2Heuristic = table.type2
+        self.type3Heuristic = table.type3
+        self.geometry = (row, col, streak)
+
     def countObjectiveIsWin(self, state: State) -> int:
         """
         [DESC]
@@ -319,7 +409,7 @@ class MinimaxGroup2:
             +inf if PLayer_1 can win
             -inf if Player_2 can win
         """
-        winner = is_win(state.board)
+        winner = is_win(state.board, state.last_move)
         if winner:
             remainderP1 = 0
             remainderP2 = 0
@@ -362,68 +452,36 @@ class MinimaxGroup2:
         ret_val = ["",""]
 
         # Get the current piece in specific row and column and mark the 'piece'.
-        row = location[0]
-        col = location[1]
-        piece = board[row, col]
+        codes = board.codes
+        cell = location[0] * board.col + location[1]
+        piece = Piece.BY_CODE[codes[cell]]
         
         # Skip checking if current piece is blank piece. 
         if piece.shape == ShapeConstant.BLANK:
             return None
-        
-        # Check if equal in shape and equal in color.
-        for prior in GameConstant.WIN_PRIOR:
-            # Initialize the streak and get the direction.
-            # If mark-1 = n_streak then you get the streak.
-            mark = 0
-            row_ax = dir[0]
-            col_ax = dir[1]
-            
-            # Move with direction (row_ax, col_ax) one time.
-            row_ = row + row_ax
-            col_ = col + col_ax
-
-            # Move n_streak-1 times until n_streak equal piece (by color or shape) is found or break if
-            # not equal piece found.
-            for _ in range(n_streak - 1):
-                if is_out(board, row_, col_):
-                    mark = 0
-                    break
 
-                # Streak checking.
-                # Checking for shape but current shape not equal with 'piece' shape.
-                shape_condition = (
-                    prior == GameConstant.SHAPE
-                    and piece.shape != board[row_, col_].shape
-                )
-                # Checking for color but current color not equal with  'piece' color.
-                color_condition = (
-                    prior == GameConstant.COLOR
-                    and piece.color != board[row_, col_].color
-                )
-                # Break if not equal.
-                if shape_condition or color_condition:
-                    mark = 0
-                    break
-
-                # Move with direction (row_ax, col_ax) one time and increase the mark.
-                row_ += row_ax
-                col_ += col_ax
-                mark += 1
+        # Get the n_streak-1 next cells with direction (row_ax, col_ax), no streak if they go out
+        # of the board.
+        index = get_window_index(board.row, board.col, board.streak)
+        ray = index.ray[cell][index.direction_id[dir]]
+        if len(ray) < n_streak - 1:
+            return ret_val
+        window = ray[:n_streak - 1]
 
-            # If you get the streak.
-            if mark == n_streak -1:
-                # Change the value of shape or color depending on the iteration.
-                if prior == GameConstant.SHAPE:
-                    ret_val[0] = piece.shape
-                else:
-                    ret_val[1] = piece.color
+        # Check if equal in shape and equal in color.
+        shape_of, color_of = Piece.SHAPE, Piece.COLOR
+        if all(shape_of[codes[i]] == piece.shape for i in window):
+            ret_val[0] = piece.shape
+        if all(color_of[codes[i]] == piece.color for i in window):
+            ret_val[1] = piece.color
 
         # Return the value.
         return ret_val 
 
     def check_3_streak_split(self, board: Board, location:Tuple[int, int],  dir:Tuple[int, int]) -> Tuple[str, str]:
         """
-            Function to check 2 streak followed by blank then the same piece from row, col in current board with specific direction
+            Function to check 2 streak followed by blank then the same piece from row, col in current board with specific direction.
+            On longer streaks, the next streak-1 tiles hold one placeable blank and streak-2 same pieces.
         [PARAMS]
             board: Board -> current board.
             location: Tuple[int, int] -> row and col
@@ -436,39 +494,35 @@ class MinimaxGroup2:
         ret_val = ["",""]
 
         # Get the current piece in specific row and column and mark the 'piece'.
-        row = location[0]
-        col = location[1]
-        piece = board[row, col]
+        codes = board.codes
+        cell = location[0] * board.col + location[1]
+        piece = Piece.BY_CODE[codes[cell]]
         
         # Skip checking if current piece is blank piece. 
         if piece.shape == ShapeConstant.BLANK:
             return None
+
+        # Get the next streak-1 cells (3 on connect 4) with direction (row_ax, col_ax), no streak if
+        # they go out of the board.
+        span = board.streak - 1
+        index = get_window_index(board.row, board.col, board.streak)
+        ray = index.ray[cell][index.direction_id[dir]]
+        if len(ray) < span:
+            return ret_val
         
         # Check if equal in shape and equal in color.
         for prior in GameConstant.WIN_PRIOR:
-            # Initialize the streak and get the direction.
-            row_ax = dir[0]
-            col_ax = dir[1]
-
             # Count number of blank tiles and streak piece in the direction
             n_blank = 0
             n_piece = 1
-            
-            # Move with direction (row_ax, col_ax) one time.
-            row_ = row + row_ax
-            col_ = col + col_ax
-
-            # Loop 3 times to check the next 3 pieces
-            for _ in range(3):
-                if is_out(board, row_, col_):
-                    n_piece = 1
-                    n_blank = 0
-                    break
 
+            # Loop streak-1 times to check the next streak-1 pieces
+            for i in ray[:span]:
                 # Streak checking.
                 # If blank, incerement n_blank if currnet n_blank = 0 and if placeable
-                if board[row_, col_].shape == ShapeConstant.BLANK:
-                    if self.is_placeable(board, row_, col_) and n_blank == 0:
+                code = codes[i]
+                if code == Piece.BLANK:
+                    if n_blank == 0 and self.is_placeable_at(board, i):
                         n_blank += 1
                     else:
                         n_piece = 1
@@ -479,12 +533,12 @@ class MinimaxGroup2:
                 else:
                     shape_condition = (
                         prior == GameConstant.SHAPE
-                        and piece.shape != board[row_, col_].shape
+                        and piece.shape != Piece.SHAPE[code]
                     )
                     # Checking for color but current color not equal with  'piece' color.
                     color_condition = (
                         prior == GameConstant.COLOR
-                        and piece.color != board[row_, col_].color
+                        and piece.color != Piece.COLOR[code]
                     )
                     # Break if not equal.
                     if shape_condition or color_condition:
@@ -494,12 +548,8 @@ class MinimaxGroup2:
 
                     n_piece += 1
 
-                # Move with direction (row_ax, col_ax) one time.
-                row_ += row_ax
-                col_ += col_ax
-
             # If you get the streak.
-            if n_piece == 3 and n_blank == 1:
+            if n_piece == span and n_blank == 1:
                 # Change the value of shape or color depending on the iteration.
                 if prior == GameConstant.SHAPE:
                     ret_val[0] = piece.shape
@@ -524,39 +574,22 @@ class MinimaxGroup2:
         # Initialize return value.
         ret_val:int = 0
 
-        # Count from start.
-        # Count free tile from start with direction = - dir
-        start_row = start[0]
-        start_col = start[1]
-        start_row_ax = -1 * dir[0]
-        start_col_ax = -1 * dir[1]
-            
-        # Move with direction (row_ax, col_ax) one time.
-        start_row_ = start_row + start_row_ax
-        start_col_ = start_col + start_col_ax
+        index = get_window_index(board.row, board.col, board.streak)
+        direction = index.direction_id[dir]
 
-        # While place_able then loop.
-        while (self.is_placeable(board, start_row_, start_col_)):
+        # Count from start.
+        # Count free tile from start with direction = - dir, while place_able then loop.
+        for i in index.ray[start[0] * board.col + start[1]][index.opposite[direction]]:
+            if not self.is_placeable_at(board, i):
+                break
             ret_val += 1
-            start_row_ = start_row_ + start_row_ax
-            start_col_ = start_col_ + start_col_ax
         
         # Count from end.
-        # Count free tile from end with direction = dir
-        end_row = end[0]
-        end_col = end[1]
-        end_row_ax = dir[0]
-        end_col_ax = dir[1]
-            
-        # Move with direction (row_ax, col_ax) one time.
-        end_row_ = end_row + end_row_ax
-        end_col_ = end_col + end_col_ax
-
-        # While place_able then loop.
-        while (self.is_placeable(board, end_row_, end_col_)):
+        # Count free tile from end with direction = dir, while place_able then loop.
+        for i in index.ray[end[0] * board.col + end[1]][direction]:
+            if not self.is_placeable_at(board, i):
+                break
             ret_val += 1
-            end_row_ = end_row_ + end_row_ax
-            end_col_ = end_col_ + end_col_ax
         
         return ret_val
 
@@ -577,15 +610,22 @@ class MinimaxGroup2:
         if is_out(board, row, col):
             return False
         
-        # False if current tile is already occupied. 
-        if board[row, col].shape != ShapeConstant.BLANK:
-            return False
+        return self.is_placeable_at(board, row * board.col + col)
 
-        # True if tile under current tile is already occupied, or if current tile at depth zero then 
-        # true.
-        if (row == 5):
-            return True
-        return board[row+1, col].shape != ShapeConstant.BLANK
+    def is_placeable_at(self, board:Board, cell:int ) -> bool:
+        """
+            Function to check can we place piece at a cell inside the board.
+
+        [PARAMS]
+            board : Board -> the game board
+            cell: int -> flat index of the cell, row * board.col + col.
+        
+        [RETURN]
+            bool -> true if you can place piece on the cell, false if not.
+        """
+        # True only for the lowest blank tile of its column, the tile a piece dropped in that
+        # column lands on.
+        return cell // board.col == board.drop_row(cell % board.col)
 
     def generatingPossibleMoves(self, state: State, n_player: int) -> Tuple[int, str]:
         """
@@ -623,13 +663,13 @@ class MinimaxGroup2:
             for shape in shape0:
                 for col in column:
                     if(state.players[n_player].quota[shape] > 0):
-                        if (state.board[0, col].shape == ShapeConstant.BLANK):
+                        if (state.board.heights[col] < state.board.row):
                             result.append((col, shape))
         else:
             for shape in shape1:
                 for col in column:
                     if(state.players[n_player].quota[shape] > 0):
-                        if (state.board[0, col].shape == ShapeConstant.BLANK):
+                        if (state.board.heights[col] < state.board.row):
                             result.append((col, shape))
                     
         return result
@@ -647,45 +687,645 @@ class MinimaxGroup2:
         possible_move =self.generatingPossibleMoves(state, n_player)
         random_number = random.randint(0, len(possible_move)-1)
         return possible_move[random_number]
+
+    def randomMoveWithValue(self, state: State, n_player: int) -> Tuple[int, str, float]:
+        '''
+        Generates a random move and evaluate the state after the move is done. The state is
+        restored before returning.
+
+        [PARAMETER]
+            state: State -> current game state.
+            n_player: int -> number of current player.
+
+        [RETURN]
+            Tuple[int, str, float] -> a random move and the value of the state after the move.
+        '''
+        random_move = self.generateRandomMove(state, n_player)
+        state.apply_move(n_player, random_move[1], random_move[0])
+        value = self.calculateValue(state)
+        state.undo_move()
+        return (random_move[0], random_move[1], value)
 # ==================================================================================================
 
 # ==========================================[MAIN METHOD]==========================================
-    def __init__(self, max_depth : int = 3) -> None:
+    def __init__(
+        self,
+        max_depth : int = None,
+        use_bitboard: bool = False,
+        tt_size_mb: float = 16,
+        use_killer_history: bool = True,
+        use_incremental_eval: bool = True,
+        use_numpy_eval: bool = False,
+        use_batched_frontier: bool = False,
+        workers: int = 1,
+        opening_book: str = None,
+        endgame_empty: int = 0,
+        persistent_search: bool = False,
+        tt_max_age: int = 4,
+    ) -> None:
         """
 		Constructor for Minimax class. Construct AI base class also.
 		
         [ATTRIBUTES]
 		    time_limit : int -> time limit for finding move.
-		    max_depth: int -> maximum depth for searching.		
+		    max_depth: int -> maximum depth for searching, None to search until the board is full.		
+		    use_bitboard: bool -> search on a BitBoard copy of the state instead of the Board.
+		    tt_size_mb: float -> memory cap of the transposition table in megabytes.
+		    use_killer_history: bool -> order moves with killer moves and history heuristic.
+		    use_incremental_eval: bool -> keep heuristic value up to date on every move instead of
+		        calling calculateValue on every leaf.
+		    use_numpy_eval: bool -> evaluate leaves with VectorizedEvaluator, needs numpy.
+		    use_batched_frontier: bool -> evaluate the children of a depth 1 node after the first one as one
+		        VectorizedEvaluator batch, needs numpy. Batched children are not pruned, so on 6x7 and 10x12
+		        boards it reaches a depth no faster than the default IncrementalEvaluator (benchmark.frontier).
+		    workers: int -> number of processes searching root moves in parallel, 1 to search in this process.
+		    opening_book: str -> opening book file consulted before searching, None (default) or missing file to
+		        always search.
+		    endgame_empty: int -> solve the game exactly when at most this many tiles are empty, 0 (default) to never
+		        solve. The solver gets up to half of the thinking time of find.
+		    persistent_search: bool -> keep transposition table, move ordering tables and principal variation
+		        between find calls of the same game instead of starting every search cold. Off by default,
+		        aged entries can change the move chosen.
+		    tt_max_age: int -> number of later searches a transposition table entry is used for.
 		"""
         self.max_depth = max_depth
-
-
-    def find(self, state: State, n_player: int, thinking_time: float) -> Tuple[str, str]:
+        self.use_bitboard = use_bitboard
+        self.tt_size_mb = tt_size_mb
+        self.tt = None
+        self.zobrist = None
+        self.tt_report = None
+        self.pv = []
+        self.follow_pv = False
+        self.root_ply = 0
+        self.use_killer_history = use_killer_history
+        self.killers = []
+        self.history = {}
+        self.resetCounters()
+        self.stats = SearchStats()
+        self.use_incremental_eval = use_incremental_eval
+        self.evaluator = None
+        self.use_numpy_eval = use_numpy_eval
+        self.use_batched_frontier = use_batched_frontier
+        self.vectorized = None
+        self.workers = workers
+        self.pool = None
+        self.shared_bound = None
+        self._root_bound = None
+        self.search_count = 0
+        self.root_player = 0
+        self.opening_book = opening_book
+        self.book = None
+        self.endgame_empty = endgame_empty
+        self.persistent_search = persistent_search
+        self.tt_max_age = tt_max_age
+        self.root_pieces = 0
+        self.solver = None
+        self.ponder_thread = None
+        self.ponder_key = None
+        self.ponder_results = []
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+
+    def find(self, state: State, n_player: int, thinking_time: float, callback: Callable[[int, Tuple[int, str], float], None] = None) -> Tuple[str, str]:
         """
-        Find is a function to find best move using minimax alpha-beta prunning. 
-        This method will initialize minimax method with it's default value parameter and update
-        used time  attribute on class.
+        Find is a function to find best move using iterative deepening minimax alpha-beta prunning. 
+        The best move of the last fully searched depth is returned when time runs out. Transposition 
+        table hit rate and memory use of the search are stored in tt_report, search counters in stats.
+        With endgame_empty, positions with few empty tiles are first given to the endgame solver for
+        up to half of thinking_time, the search gets the rest if the solver proves no win or draw.
                 
         [PARAMETER]
             state: state -> current game state.
             maximizing_player :bool -> boolean indicating to maximize objective function or not.
+            callback: Callable -> called with (depth, move, score) every time a depth is completed.
         
         [RETURN]
             Tuple[str, str] -> the best move for current player.
         """
-        self.thinking_time = time() + thinking_time
-        best_movement = self.minimax(self.max_depth, state, float('-inf'), float('inf'), n_player) #minimax algorithm
+        start = time()
+        self.stats = SearchStats()
+
+        def completed(depth: int, move: Tuple[int, str], score: float) -> None:
+            self.stats.depth = depth
+            self.stats.depth_times.append(time() - start)
+            if callback is not None:
+                callback(depth, move, score)
+
+        pondered_move = self.stopPondering(state, n_player, thinking_time, completed)
+        if pondered_move is not None:
+            self.recordStats("ponder", start)
+            return pondered_move
+
+        self.pv = []
+        book_move = self.bookMove(state, n_player)
+        if book_move is not None:
+            self.recordStats("book", start)
+            return book_move
+
+        # Solver gets half of the time, the heuristic search the rest if nothing is proven.
+        endgame_move = self.endgameMove(state, n_player, start + thinking_time / 2, completed)
+        if endgame_move is not None:
+            self.recordStats("endgame", start)
+            return endgame_move
+        thinking_time -= time() - start
+
+        best_movement = None
+        search = self.iterateParallel if self.workers > 1 else self.iterate
+        for depth, move, score in search(state, n_player, thinking_time):
+            best_movement = move
+            completed(depth, move, score)
+
+        source = "search"
+        if best_movement is None:
+            source = "random"
+            best_movement = self.generateRandomMove(state, n_player)
+        self.recordStats(source, start)
         
         return (best_movement[0], best_movement[1])
 
-    def minimax(self, depth: int, state: State, alpha: int, beta: int, n_player: int) -> Tuple[str, str, float]:
+    def iterate(self, state: State, n_player: int, thinking_time: float) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+        """
+        Iterative deepening search. Search to depth 1, 2, ... until max_depth, the board is full
+        or time runs out. Every iteration searches the principal variation of the previous one first.
+        State is unchanged between yields.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+            thinking_time: float -> time limit in seconds.
+
+        [RETURN]
+            Iterator[Tuple[int, Tuple[int, str], float]] -> (depth, best move, score) of every completed depth.
+        """
+        self.thinking_time = time() + thinking_time
+        return self.deepen(state, n_player)
+
+    def deepen(self, state: State, n_player: int) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+        """
+        Iterative deepening loop of iterate, searching until the time in thinking_time. The time
+        can be changed by another thread while searching to stop or extend the search.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+
+        [RETURN]
+            Iterator[Tuple[int, Tuple[int, str], float]] -> (depth, best move, score) of every completed depth.
+        """
+        if self.use_bitboard:
+            state = to_bitboard_state(state)
+        self.prepareSearch(state)
+        self.root_player = n_player
+
+        key = self.zobrist.hash(state, n_player)
+        if self.persistent_search:
+            # Best moves kept from the previous search, from the position actually reached.
+            self.pv = self.principalVariation(state, n_player, key, self.maxSearchDepth(state))
+        for depth in range(1, self.maxSearchDepth(state) + 1):
+            self.follow_pv = True
+            try:
+                best_movement = self.minimax(depth, state, float('-inf'), float('inf'), n_player, key) #minimax algorithm
+            except SearchTimeout:
+                self.timeouts += 1
+                while len(state.history) > self.root_ply:
+                    state.undo_move()
+                    if self.evaluator is not None:
+                        self.evaluator.undo()
+                break
+            finally:
+                self.tt_report = self.tt.report()
+
+            move = (best_movement[0], best_movement[1])
+            self.pv = self.principalVariation(state, n_player, key, depth)
+            yield (depth, move, best_movement[2])
+
+            # Win or lose is already proven, searching deeper will not change the move.
+            if abs(best_movement[2]) >= 10000:
+                break
+
+    def ponder(self, state: State, n_player: int) -> None:
+        """
+        Start searching in a background thread while the opponent thinks. The searched position
+        is state after the opponent reply predicted by the principal variation of the last find.
+        Does nothing if there is no prediction, which is always the case with workers > 1 since
+        root moves searched in worker processes have no principal variation. Searching threads
+        share the GIL, so pondering slows down any other bot searching in the same process.
+
+        [PARAMETER]
+            state: state -> current game state, after the move of this bot.
+            n_player: int -> number of this bot player.
+        """
+        self.stopPondering()
+        if len(self.pv) < 2:
+            return
+        reply = self.pv[1]
+        ponder_state = copy_state(state)
+        if ponder_state.apply_move(1 - n_player, reply[1], reply[0]) == -1:
+            return
+        if is_win(ponder_state.board, ponder_state.last_move) or is_full(ponder_state.board):
+            return
+        # Endgame positions are left to the solver of find.
+        n_empty = ponder_state.board.row * ponder_state.board.col - ponder_state.board.filled
+        if n_empty <= self.endgame_empty:
+            return
+
+        self.ponder_key = self.zobrist.hash(ponder_state, n_player)
+        self.ponder_results = []
+        self.thinking_time = float("inf")
+        self.ponder_thread = threading.Thread(target=self.ponderSearch, args=(ponder_state, n_player), daemon=True)
+        self.ponder_thread.start()
+
+    def ponderSearch(self, state: State, n_player: int) -> None:
+        """
+        Body of the pondering thread, keep every completed depth in ponder_results.
+        """
+        for result in self.deepen(state, n_player):
+            self.ponder_results.append(result)
+
+    def stopPondering(self, state: State = None, n_player: int = None, thinking_time: float = 0, callback: Callable[[int, Tuple[int, str], float], None] = None) -> Tuple[int, str]:
+        """
+        Stop pondering. If state is the pondered position (ponder hit), the pondering search
+        goes on for thinking_time and its best move is returned. Otherwise (ponder miss) its
+        work is discarded.
+
+        [PARAMETER]
+            state: state -> current game state, None to only stop pondering.
+            n_player: int -> number of current player.
+            thinking_time: float -> time limit in seconds of a ponder hit.
+            callback: Callable -> called with (depth, move, score) of every depth pondered.
+
+        [RETURN]
+            None if nothing was pondered or the pondered position is not state.
+            Tuple[int, str] -> best move of the pondering search.
+        """
+        if self.ponder_thread is None:
+            return None
+        hit = state is not None and self.zobrist.hash(state, n_player) == self.ponder_key
+        if hit:
+            self.thinking_time = time() + thinking_time
+            self.ponder_thread.join()
+        else:
+            # Thread may not have read thinking_time yet, keep setting it until it stops.
+            while self.ponder_thread.is_alive():
+                self.thinking_time = 0
+                self.ponder_thread.join(0.01)
+        self.ponder_thread = None
+        self.ponder_key = None
+        if state is None:
+            return None
+
+        if not hit or not self.ponder_results:
+            self.ponder_misses += 1
+            return None
+        self.ponder_hits += 1
+        if callback is not None:
+            for depth, move, score in self.ponder_results:
+                callback(depth, move, score)
+        return self.ponder_results[-1][1]
+
+    def ponderReport(self) -> Dict[str, float]:
+        """
+        Summarize pondering since the bot was created.
+
+        [RETURN]
+            Dict -> hits, misses and hit_rate.
+        """
+        total = self.ponder_hits + self.ponder_misses
+        return {
+            "hits": self.ponder_hits,
+            "misses": self.ponder_misses,
+            "hit_rate": self.ponder_hits / total if total else 0.0,
+        }
+
+    def bookMove(self, state: State, n_player: int) -> Tuple[int, str]:
+        """
+        Look the state up in the opening book. The book is memory-mapped on first use.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+
+        [RETURN]
+            None if there is no book, the state is not in it or its move is not valid.
+            Tuple[int, str] -> book move.
+        """
+        if self.book is None:
+            if self.opening_book is None or not os.path.exists(self.opening_book):
+                return None
+            self.book = OpeningBook(self.opening_book)
+        # The book is built for connect 4.
+        if (self.book.row, self.book.col, GameConstant.N_COMPONENT_STREAK) != (state.board.row, state.board.col, state.board.streak):
+            return None
+
+        if self.zobrist is None or (self.zobrist.row, self.zobrist.col, self.zobrist.streak) != (state.board.row, state.board.col, state.board.streak):
+            self.zobrist = ZobristHash(state.board.row, state.board.col, streak=state.board.streak)
+        entry = self.book.lookup(self.zobrist.hash(state, n_player))
+        if entry is None:
+            return None
+        col, shape, _ = entry
+        if state.players[n_player].quota[shape] == 0 or state.board.heights[col] == state.board.row:
+            return None
+        return (col, shape)
+
+    def endgameMove(self, state: State, n_player: int, deadline: float, callback: Callable[[int, Tuple[int, str], float], None] = None) -> Tuple[int, str]:
+        """
+        Solve the state exactly when few tiles are empty. A proven loss is left to the heuristic
+        search, which looks for the move the opponent is most likely to miss.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+            deadline: float -> time when solving must stop.
+            callback: Callable -> called with (empty tiles, move, score) when a result is proven.
+
+        [RETURN]
+            None if there are too many empty tiles, the result is not proven before deadline or it is a loss.
+            Tuple[int, str] -> move winning or drawing.
+        """
+        n_empty = state.board.row * state.board.col - state.board.filled
+        if n_empty > self.endgame_empty:
+            return None
+        zobrist = self.solver.zobrist if self.solver is not None else None
+        if zobrist is None or (zobrist.row, zobrist.col, zobrist.streak) != (state.board.row, state.board.col, state.board.streak):
+            self.solver = EndgameSolver(self, state.board.row, state.board.col, streak=state.board.streak)
+        if self.use_bitboard:
+            state = to_bitboard_state(state)
+
+        solved = self.solver.solve(state, n_player, deadline)
+        if solved is None or solved[0] is None or solved[1] < 0:
+            return None
+        move, result = solved
+        if callback is not None:
+            # Score is seen by player 1 like the heuristic.
+            callback(n_empty, move, 10000 * (result if n_player == 0 else -result))
+        return move
+
+    def prepareSearch(self, state: State) -> None:
+        """
+        Reset transposition table, move ordering tables, counters and evaluators before searching
+        from state. With persistent_search, tables of the previous search are kept if state comes
+        later in the same game: killer moves are shifted by the number of moves played since and
+        history scores are halved, so recent cutoffs weigh more.
+
+        [PARAMETER]
+            state: state -> root state of the search.
+        """
+        n_piece = state.board.filled
+        n_ply = state.board.row * state.board.col + 1
+        warm = self.persistent_search and n_piece >= self.root_pieces and len(self.killers) == n_ply
+        self.prepareTranspositionTable(state, warm)
+        self.root_ply = len(state.history)
+        self.pv = []
+        if warm:
+            played = n_piece - self.root_pieces
+            self.killers = self.killers[played:] + [[] for _ in range(played)]
+            self.history = {move: score // 2 for move, score in self.history.items()}
+        else:
+            self.killers = [[] for _ in range(n_ply)]
+            self.history = {}
+        self.root_pieces = n_piece
+        self.resetCounters()
+        self.evaluator = None
+        if self.use_numpy_eval or self.use_batched_frontier:
+            if self.vectorized is None or (self.vectorized.row, self.vectorized.col, self.vectorized.streak) != (state.board.row, state.board.col, state.board.streak):
+                self.vectorized = VectorizedEvaluator(self, state.board.row, state.board.col, state.board.streak)
+        if self.use_incremental_eval and not self.use_numpy_eval:
+            self.evaluator = IncrementalEvaluator(self, state)
+
+    def maxSearchDepth(self, state: State) -> int:
+        """
+        Deepest iteration worth searching, max_depth or the number of empty tiles.
+
+        [PARAMETER]
+            state: state -> root state of the search.
+
+        [RETURN]
+            int -> maximum depth.
+        """
+        n_empty = state.board.row * state.board.col - state.board.filled
+        return n_empty if self.max_depth is None else min(self.max_depth, n_empty)
+
+    def iterateParallel(self, state: State, n_player: int, thinking_time: float) -> Iterator[Tuple[int, Tuple[int, str], float]]:
+        """
+        Iterative deepening search with root moves split across worker processes. Every root move
+        of a depth is searched by one worker, best score found so far is shared by every worker so
+        it tightens their alpha-beta window. A depth is completed when every root move is searched
+        before the deadline.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+            thinking_time: float -> time limit in seconds.
+
+        [RETURN]
+            Iterator[Tuple[int, Tuple[int, str], float]] -> (depth, best move, score) of every completed depth.
+        """
+        deadline = time() + thinking_time
+        if self.pool is None:
+            # The bound is only read by workers, searches of this bot are not narrowed by it.
+            self._root_bound = multiprocessing.Value("d", 0.0)
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_root_worker,
+                initargs=(self.workerOptions(), self._root_bound),
+            )
+        self.search_count += 1
+        self.tt_report = None
+        self.resetCounters()
+        worst = float("-inf") if n_player == 0 else float("inf")
+
+        possible_moves = self.generatingPossibleMoves(state, n_player)
+        for depth in range(1, self.maxSearchDepth(state) + 1):
+            with self._root_bound.get_lock():
+                self._root_bound.value = worst
+            futures = [
+                self.pool.submit(_search_root_move, self.search_count, state, n_player, move, depth, deadline)
+                for move in possible_moves
+            ]
+            done, not_done = wait(futures, timeout=max(0.0, deadline - time()))
+            for future in not_done:
+                future.cancel()
+            wait(not_done)
+
+            results = [future.result() if future.done() and not future.cancelled() else None for future in futures]
+            for result in results:
+                if result is not None:
+                    self.nodes += result[2]
+                    self.cutoffs += result[3]
+                    self.first_move_cutoffs += result[4]
+                    self.leaves += result[5]
+                    self.eval_time += result[6]
+            if any(result is None for result in results):
+                self.timeouts += 1
+                break
+
+            # Score equal to the shared bound may only be a bound, prefer the exact one.
+            best_index = 0
+            for i, (score, bounded, *_) in enumerate(results):
+                best_score, best_bounded = results[best_index][:2]
+                better = score > best_score if n_player == 0 else score < best_score
+                if better or (score == best_score and best_bounded and not bounded):
+                    best_index = i
+            move = possible_moves[best_index]
+            score = results[best_index][0]
+            yield (depth, move, score)
+
+            # Search the best move first on the next depth, its score tightens the window first.
+            possible_moves.remove(move)
+            possible_moves.insert(0, move)
+            if abs(score) >= 10000:
+                break
+
+    def workerOptions(self) -> Dict[str, object]:
+        """
+        Constructor arguments of the bots searching root moves in worker processes.
+
+        [RETURN]
+            Dict -> keyword arguments of MinimaxGroup2.
+        """
+        return {
+            "use_bitboard": self.use_bitboard,
+            "tt_size_mb": self.tt_size_mb,
+            "use_killer_history": self.use_killer_history,
+            "use_incremental_eval": self.use_incremental_eval,
+            "use_numpy_eval": self.use_numpy_eval,
+            "use_batched_frontier": self.use_batched_frontier,
+            "persistent_search": self.persistent_search,
+            "tt_max_age": self.tt_max_age,
+        }
+
+    def searchRootMove(self, search_id: int, state: State, n_player: int, move: Tuple[int, str], depth: int, deadline: float) -> Tuple[float, bool, int, int, int, int, float]:
+        """
+        Search one root move in a worker process. Transposition table and move ordering tables are
+        kept between root moves of the same search.
+
+        [PARAMETER]
+            search_id: int -> id of the find call, tables are reset when it changes.
+            state: state -> root state of the search.
+            n_player: int -> number of root player.
+            move: Tuple[int, str] -> root move to be searched.
+            depth: int -> depth of the iteration, counted from the root.
+            deadline: float -> time when the search must stop.
+
+        [RETURN]
+            None if deadline is reached.
+            Tuple[float, bool, int, int, int, int, float] -> score, whether score is only a bound because it
+            does not beat the shared bound, nodes, cutoffs, first move cutoffs, leaves and evaluation time.
+        """
+        self.thinking_time = deadline
+        if self.use_bitboard:
+            state = to_bitboard_state(state)
+        if search_id != self.search_count:
+            self.search_count = search_id
+            self.prepareSearch(state)
+        else:
+            self.root_ply = len(state.history)
+            self.resetCounters()
+            self.evaluator = IncrementalEvaluator(self, state) if self.use_incremental_eval and not self.use_numpy_eval else None
+        self.root_player = n_player
+        self.follow_pv = False
+
+        state.apply_move(n_player, move[1], move[0])
+        if self.evaluator is not None:
+            self.evaluator.apply(state)
+        key = self.zobrist.hash(state, 1 - n_player)
+        try:
+            score = self.minimax(depth - 1, state, float('-inf'), float('inf'), 1 - n_player, key)[2]
+        except SearchTimeout:
+            return None
+        finally:
+            # Moves of a search cut by the deadline are undone too.
+            while len(state.history) > self.root_ply:
+                state.undo_move()
+                if self.evaluator is not None:
+                    self.evaluator.undo()
+
+        with self.shared_bound.get_lock():
+            bound = self.shared_bound.value
+            bounded = score <= bound if n_player == 0 else score >= bound
+            if not bounded:
+                self.shared_bound.value = score
+        return (score, bounded, self.nodes, self.cutoffs, self.first_move_cutoffs, self.leaves, self.eval_time)
+
+    def close(self) -> None:
+        """
+        Shut down worker processes of the parallel search and close the opening book, it is
+        opened again if the bot searches later.
+        """
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+            self._root_bound = None
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["shared_bound"] = None
+        state["_root_bound"] = None
+        state["book"] = None
+        state["solver"] = None
+        state["ponder_thread"] = None
+        return state
+
+    def principalVariation(self, state: State, n_player: int, key: int, depth: int) -> List[Tuple[int, str]]:
+        """
+        Follow best moves stored in the transposition table from the current state.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+            key: int -> zobrist key of the state.
+            depth: int -> maximum length of the variation.
+
+        [RETURN]
+            List[Tuple[int, str]] -> expected moves of both players, starting with current player.
+        """
+        pv = []
+        while len(pv) < depth:
+            entry = self.tt.probe(key)
+            if entry is None or entry[4] is None:
+                break
+            move = entry[4]
+            row = state.apply_move(n_player, move[1], move[0])
+            if row == -1:
+                break
+            key ^= self.zobrist.move_key(row, move[0], n_player, move[1], state.players[n_player].quota[move[1]])
+            pv.append(move)
+            n_player = 1 - n_player
+        for _ in pv:
+            state.undo_move()
+        return pv
+
+    def prepareTranspositionTable(self, state: State, keep: bool = False) -> None:
+        """
+        Create zobrist keys for the board geometry and an empty transposition table.
+
+        [PARAMETER]
+            state: state -> current game state.
+            keep: bool -> keep entries of previous searches, aged by one search.
+        """
+        if self.zobrist is None or (self.zobrist.row, self.zobrist.col, self.zobrist.streak) != (state.board.row, state.board.col, state.board.streak):
+            self.zobrist = ZobristHash(state.board.row, state.board.col, streak=state.board.streak)
+            keep = False
+        if self.tt is None:
+            self.tt = TranspositionTable(self.tt_size_mb, self.tt_max_age)
+        if keep:
+            self.tt.new_search()
+        else:
+            self.tt.clear()
+
+    def minimax(self, depth: int, state: State, alpha: int, beta: int, n_player: int, key: int = None) -> Tuple[str, str, float]:
         """
         Minimax is a function to implement minimax alpha-beta pruning on every possible_move 
         while monitoring time and depth constraint. If AI has not reached time limit or depth 
         limit, then AI will continue to traverse tree until it's reach  leaf node or it's limit. Else if AI 
-        has reach it's limit then AI will immediately return the  best move so far or return null 
-        movement (depend on spek tubes)
+        has reach it's limit then SearchTimeout is raised, moves applied on the state are left for
+        the caller to undo. Result of every node is stored in the transposition table so 
+        transpositions are not searched again.
 		
         [PARAMETER]
             possible_move: List[Tuple[str, str]] -> current available move for current player.
@@ -694,81 +1334,291 @@ class MinimaxGroup2:
             alpha: int -> the best solution so far.
             beta : int -> the worst solution so far.
             maximizing_player :bool -> boolean indicating to maximize objective function or not
+            key: int -> zobrist key of the state.
         
         [RETURN]
 		    Tuple[str, str] -> the best move for current player.
 		"""
-        current_time = time()
-        if depth == 0 or is_win(state.board) or is_full(state.board) or current_time>self.thinking_time:
-            if(current_time>self.thinking_time):
-                print("BOOM WAKTU ABIS")
-            return ("-", -1, self.calculateValue(state))
+        if key is None:
+            key = self.zobrist.hash(state, n_player)
+
+        if(time()>self.thinking_time):
+            raise SearchTimeout()
+        self.nodes += 1
+
+        # Score already reached by another root move of a parallel search.
+        if self.shared_bound is not None:
+            if self.root_player == 0:
+                alpha = max(alpha, self.shared_bound.value)
+            else:
+                beta = min(beta, self.shared_bound.value)
+
+        # Transposition table lookup.
+        alpha_orig = alpha
+        beta_orig = beta
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            _, entry_depth, flag, score, tt_move = entry
+            if entry_depth >= depth:
+                if flag == TranspositionTable.LOWER:
+                    alpha = max(alpha, score)
+                elif flag == TranspositionTable.UPPER:
+                    beta = min(beta, score)
+                if flag == TranspositionTable.EXACT or beta <= alpha:
+                    if tt_move is None:
+                        return ("-", -1, score)
+                    return (tt_move[0], tt_move[1], score)
+
+        if depth == 0 or is_win(state.board, state.last_move) or is_full(state.board):
+            self.follow_pv = False
+            value = self.evaluateLeaf(state)
+            self.tt.store(key, depth, TranspositionTable.EXACT, value, None)
+            return ("-", -1, value)
+
+        possible_moves = self.orderMoves(self.generatingPossibleMoves(state, n_player), state, tt_move)
+
+        # Children of a depth 1 node are leaves. The first one, best by move ordering, is searched
+        # alone since it often causes a cutoff, the others are evaluated as one batch only if it
+        # does not.
+        batch_frontier = self.use_batched_frontier and depth == 1 and len(possible_moves) > 1
+        frontier_values = None
 
-        possible_moves = self.generatingPossibleMoves(state, n_player)
         if(n_player == 0):
             maxEval = float('-inf')
             next_depth = depth - 1
             selected_move = ("-", 0, 0)
-            for move in possible_moves:
-                current_time = time()
-                if(current_time>self.thinking_time):
-                    print("BOOM WAKTU ABIS")
-                    if(selected_move == ("-", 0, 0)):
-                        random_move = self.generateRandomMove(state, n_player)
-                        next_state = copy.deepcopy(state)
-                        place(next_state, n_player, random_move[1], random_move[0])
-                        return (random_move[0], random_move[1], self.calculateValue(next_state))
-                    else:
-                        return selected_move
-                next_state = copy.deepcopy(state)
-                place(next_state, n_player, move[1], move[0])
-                eval = self.minimax(next_depth, next_state, alpha, beta, 1)
+            for i, move in enumerate(possible_moves):
+                if batch_frontier and i == 1:
+                    frontier_values = self.evaluateFrontier(state, n_player, key, possible_moves[1:])
+                if frontier_values is not None:
+                    eval = ("-", -1, frontier_values[i - 1])
+                else:
+                    row = state.apply_move(n_player, move[1], move[0])
+                    if self.evaluator is not None:
+                        self.evaluator.apply(state)
+                    next_key = key ^ self.zobrist.move_key(row, move[0], n_player, move[1], state.players[n_player].quota[move[1]])
+                    eval = self.minimax(next_depth, state, alpha, beta, 1, next_key)
+                    state.undo_move()
+                    if self.evaluator is not None:
+                        self.evaluator.undo()
                 if(eval[2] > maxEval):
                     maxEval = eval[2]
                     selected_move = (move[0], move[1], eval[2])
                 alpha = max(alpha, eval[2])
                 if(beta <= alpha):
+                    self.recordCutoff(state, move, depth, possible_moves)
                     break
                 
             if(selected_move == ("-", 0, 0)):
-                random_move = self.generateRandomMove(state, n_player)
-                next_state = copy.deepcopy(state)
-                place(next_state, n_player, random_move[1], random_move[0])
-                return (random_move[0], random_move[1], self.calculateValue(next_state))
+                return self.randomMoveWithValue(state, n_player)
             else:
+                self.storeResult(key, depth, selected_move, alpha_orig, beta_orig)
                 return selected_move  
         else:
             minEval = float('inf')
             next_depth = depth - 1
             selected_move = ("-", 0, 0)
-            for move in possible_moves:
-                current_time = time()
-                if(current_time>self.thinking_time):
-                    print("BOOM WAKTU ABIS")
-                    if(selected_move == ("-", 0, 0)):
-                        random_move = self.generateRandomMove(state, n_player)
-                        next_state = copy.deepcopy(state)
-                        place(next_state, n_player, random_move[1], random_move[0])
-                        return (random_move[0], random_move[1], self.calculateValue(next_state))
-                    else:
-                        return selected_move
-                next_state = copy.deepcopy(state)
-                place(next_state, n_player, move[1], move[0])
-                eval = self.minimax(next_depth, next_state, alpha, beta, 0)
+            for i, move in enumerate(possible_moves):
+                if batch_frontier and i == 1:
+                    frontier_values = self.evaluateFrontier(state, n_player, key, possible_moves[1:])
+                if frontier_values is not None:
+                    eval = ("-", -1, frontier_values[i - 1])
+                else:
+                    row = state.apply_move(n_player, move[1], move[0])
+                    if self.evaluator is not None:
+                        self.evaluator.apply(state)
+                    next_key = key ^ self.zobrist.move_key(row, move[0], n_player, move[1], state.players[n_player].quota[move[1]])
+                    eval = self.minimax(next_depth, state, alpha, beta, 0, next_key)
+                    state.undo_move()
+                    if self.evaluator is not None:
+                        self.evaluator.undo()
                 if(eval[2] < minEval):
                     minEval = eval[2]
                     selected_move = (move[0], move[1], eval[2])
                 beta = min(beta, eval[2])
                 if(beta <= alpha):
+                    self.recordCutoff(state, move, depth, possible_moves)
                     break
             
             if(selected_move == ("-", 0, 0)):
-                random_move = self.generateRandomMove(state, n_player)
-                next_state = copy.deepcopy(state)
-                place(next_state, n_player, random_move[1], random_move[0])
-                return (random_move[0], random_move[1], self.calculateValue(next_state))
+                return self.randomMoveWithValue(state, n_player)
             else:
+                self.storeResult(key, depth, selected_move, alpha_orig, beta_orig)
                 return selected_move  
+
+    def evaluateLeaf(self, state: State) -> float:
+        """
+        Value of a leaf, from the NumPy or the incremental evaluator if it is used.
+
+        [PARAMETER]
+            state: state -> current game state.
+
+        [RETURN]
+            float -> the value of the state, same as calculateValue.
+        """
+        start = time()
+        if self.use_numpy_eval and self.vectorized is not None:
+            value = self.vectorized.value(state)
+        elif self.evaluator is not None:
+            value = self.evaluator.value(state)
+        else:
+            value = self.calculateValue(state)
+        self.leaves += 1
+        self.eval_time += time() - start
+        return value
+
+    def evaluateFrontier(self, state: State, n_player: int, key: int, possible_moves: List[Tuple[int, str]]) -> List[float]:
+        """
+        Value of the children of a depth 1 node left after its first child, scored by
+        VectorizedEvaluator in one batch. Every child is counted as a node and stored in the
+        transposition table like a leaf, but unlike a leaf searched alone it is not looked up in
+        the table first, and children after a cutoff are evaluated too.
+
+        [PARAMETER]
+            state: state -> current game state.
+            n_player: int -> number of current player.
+            key: int -> zobrist key of the state.
+            possible_moves: List[Tuple[int, str]] -> moves of current player to evaluate.
+
+        [RETURN]
+            List[float] -> value of the state after every move.
+        """
+        self.follow_pv = False
+        start = time()
+        values, rows = self.vectorized.children(state, n_player, possible_moves)
+        self.eval_time += time() - start
+        self.nodes += len(possible_moves)
+        self.leaves += len(possible_moves)
+        for move, row, value in zip(possible_moves, rows, values):
+            quota = state.players[n_player].quota[move[1]] - 1
+            next_key = key ^ self.zobrist.move_key(row, move[0], n_player, move[1], quota)
+            self.tt.store(next_key, 0, TranspositionTable.EXACT, value, None)
+        return values
+
+    def orderMoves(self, possible_moves: List[Tuple[int, str]], state: State, tt_move: Tuple[int, str]) -> List[Tuple[int, str]]:
+        """
+        Order moves to get alpha-beta cutoff as early as possible. The move of the previous iteration 
+        principal variation goes first while the search is still following it, otherwise the 
+        transposition table move goes first. Killer moves of the ply follow, then the remaining 
+        moves by history heuristic score, keeping the static order on ties.
+
+        [PARAMETER]
+            possible_moves: List[Tuple[int, str]] -> moves in static order.
+            state: state -> current game state.
+            tt_move: Tuple[int, str] -> best move stored in the transposition table, or None.
+
+        [RETURN]
+            List[Tuple[int, str]] -> ordered moves.
+        """
+        ply = len(state.history) - self.root_ply
+        first_move = tt_move
+        if self.follow_pv:
+            if ply < len(self.pv) and self.pv[ply] in possible_moves:
+                first_move = self.pv[ply]
+            else:
+                self.follow_pv = False
+
+        if self.use_killer_history:
+            if self.history:
+                possible_moves.sort(key=lambda move: -self.history.get(move, 0))
+            for killer in reversed(self.killers[ply]):
+                if killer in possible_moves:
+                    possible_moves.remove(killer)
+                    possible_moves.insert(0, killer)
+
+        if first_move in possible_moves:
+            possible_moves.remove(first_move)
+            possible_moves.insert(0, first_move)
+        return possible_moves
+
+    def recordCutoff(self, state: State, move: Tuple[int, str], depth: int, possible_moves: List[Tuple[int, str]]) -> None:
+        """
+        Count a beta cutoff and remember the move causing it as killer move of the ply and in the 
+        history table.
+
+        [PARAMETER]
+            state: state -> game state of the node, after the move is undone.
+            move: Tuple[int, str] -> move causing the cutoff.
+            depth: int -> remaining depth of the node.
+            possible_moves: List[Tuple[int, str]] -> ordered moves of the node.
+        """
+        self.cutoffs += 1
+        if move == possible_moves[0]:
+            self.first_move_cutoffs += 1
+        if not self.use_killer_history:
+            return
+
+        killers = self.killers[len(state.history) - self.root_ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def resetCounters(self) -> None:
+        """
+        Reset search counters read by orderingReport and recordStats.
+        """
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.timeouts = 0
+        self.eval_time = 0.0
+
+    def recordStats(self, source: str, start: float) -> None:
+        """
+        Copy search counters of the last find to stats.
+
+        [PARAMETER]
+            source: str -> where the move comes from: search, ponder, book, endgame or random.
+            start: float -> time when find started.
+        """
+        self.stats.source = source
+        self.stats.total_time = time() - start
+        if source in ("search", "ponder", "random"):
+            self.stats.nodes = self.nodes
+            self.stats.leaves = self.leaves
+            self.stats.cutoffs = self.cutoffs
+            self.stats.first_move_cutoffs = self.first_move_cutoffs
+            self.stats.timeouts = self.timeouts
+            self.stats.eval_time = self.eval_time
+        elif source == "endgame":
+            self.stats.nodes = self.solver.nodes
+
+    def orderingReport(self) -> Dict[str, float]:
+        """
+        Summarize the tree of the last find.
+
+        [RETURN]
+            Dict -> nodes, cutoffs, first_move_cutoffs and first_move_cutoff_rate.
+        """
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+        }
+
+    def storeResult(self, key: int, depth: int, selected_move: Tuple[int, str, float], alpha: float, beta: float) -> None:
+        """
+        Store search result of a node in the transposition table.
+
+        [PARAMETER]
+            key: int -> zobrist key of the node.
+            depth: int -> depth searched below the node.
+            selected_move: Tuple[int, str, float] -> best move and its value.
+            alpha: float -> alpha when the node was entered.
+            beta: float -> beta when the node was entered.
+        """
+        value = selected_move[2]
+        if value <= alpha:
+            flag = TranspositionTable.UPPER
+        elif value >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.tt.store(key, depth, flag, value, (selected_move[0], selected_move[1]))
 #===================================================================================================
     
 
@@ -0,0 +1,182 @@
+import mmap
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from time import time
+from typing import Dict, Tuple
+
+from src.constant import GameConstant
+from src.model import Board, Config, Player, State
+from src.ai.transposition import ZobristHash
+from src.utility import is_win, copy_state
+
+
+class OpeningBook:
+    """
+    Class for read-only opening book file. The file is a header followed by fixed size records
+    sorted by zobrist key, so it is memory-mapped as is and searched with binary search without
+    parsing anything on load.
+
+    File layout, little endian:
+        header: magic b"SPOB", version u16, row u16, col u16, count u32
+        record: key u64, column u8, shape u8 (ASCII), 2 padding bytes, score f32
+
+    [ATTRIBUTES]
+        row: int -> boards row shape of the book
+        col: int -> boards column shape of the book
+        count: int -> number of records
+    """
+
+    MAGIC = b"SPOB"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHHI")
+    RECORD = struct.Struct("<QBBxxf")
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.row, self.col, self.count = self.HEADER.unpack_from(self.data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    def lookup(self, key: int) -> Tuple[int, str, float]:
+        """
+        [DESC]
+            Function to find book move of a position with binary search
+        [PARAMS]
+            key: int -> zobrist key of the position
+        [RETURN]
+            None if position is not in book
+            Tuple[column, shape, score] if position is in book
+        """
+        low = 0
+        high = self.count
+        while low < high:
+            mid = (low + high) // 2
+            offset = self.HEADER.size + mid * self.RECORD.size
+            mid_key = struct.unpack_from("<Q", self.data, offset)[0]
+            if mid_key < key:
+                low = mid + 1
+            elif mid_key > key:
+                high = mid
+            else:
+                _, col, shape, score = self.RECORD.unpack_from(self.data, offset)
+                return (col, chr(shape), score)
+        return None
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @classmethod
+    def write(cls, path: str, row: int, col: int, entries: Dict[int, Tuple[int, str, float]]):
+        """
+        [DESC]
+            Function to write opening book file
+        [PARAMS]
+            path: str -> output file
+            row: int -> boards row shape
+            col: int -> boards column shape
+            entries: Dict[int, Tuple[int, str, float]] -> (column, shape, score) of every position key
+        """
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, row, col, len(entries)))
+            for key in sorted(entries):
+                move_col, shape, score = entries[key]
+                f.write(cls.RECORD.pack(key, move_col, ord(shape), score))
+
+
+def initial_state(row: int, col: int) -> State:
+    """
+    [DESC]
+        Function to build the starting state of a game, same quota as Game
+    """
+    config = Config(row, col, GameConstant.BVB, None, False, 0)
+    players = [
+        Player(GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR, dict(config.quota[0])),
+        Player(GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR, dict(config.quota[1])),
+    ]
+    return State(Board(row, col), players, 1)
+
+
+def search_position(state: State, n_player: int, depth: int) -> Tuple[int, str, float]:
+    """
+    [DESC]
+        Function to search best move of a book position, run in a worker process
+    [RETURN]
+        Tuple[column, shape, score] -> best move and its score
+    """
+    from src.ai.minimax import MinimaxGroup2
+
+    bot = MinimaxGroup2(max_depth=depth, opening_book=None)
+    scores = []
+    move = bot.find(state, n_player, float("inf"), callback=lambda d, m, score: scores.append(score))
+    return (move[0], move[1], scores[-1])
+
+
+def build(path: str, row: int = 6, col: int = 7, plies: int = 8, depth: int = 6, workers: int = None) -> int:
+    """
+    [DESC]
+        Function to search opening positions and write them to a book. For each player, every
+        position reached by the book move of that player and any move of the other player is
+        searched, until plies moves are played. Positions of the same ply are searched in parallel
+    [PARAMS]
+        path: str -> output file
+        row: int -> boards row shape
+        col: int -> boards column shape
+        plies: int -> number of moves from the starting position covered by the book
+        depth: int -> search depth of every position
+        workers: int -> number of processes, every core if None
+    [RETURN]
+        int -> number of positions in the book
+    """
+    from src.ai.minimax import MinimaxGroup2
+
+    zobrist = ZobristHash(row, col)
+    bot = MinimaxGroup2()
+    entries: Dict[int, Tuple[int, str, float]] = {}
+    # Positions to search, with the player owning the book line.
+    frontier: Dict[Tuple[int, int], Tuple[State, int]] = {}
+    root = initial_state(row, col)
+    for book_player in range(2):
+        frontier[(zobrist.hash(root, 0), book_player)] = (root, book_player)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for ply in range(plies):
+            start = time()
+            n_player = ply % 2
+            # Finished games have no book move.
+            states = [(state, book_player) for state, book_player in frontier.values() if not is_win(state.board)]
+            to_search = {}
+            for state, _ in states:
+                key = zobrist.hash(state, n_player)
+                if key not in entries and key not in to_search:
+                    to_search[key] = state
+            results = pool.map(search_position, to_search.values(), [n_player] * len(to_search), [depth] * len(to_search))
+            for key, result in zip(to_search, results):
+                entries[key] = result
+
+            next_frontier = {}
+            for state, book_player in states:
+                key = zobrist.hash(state, n_player)
+                if n_player == book_player:
+                    moves = [entries[key][:2]]
+                else:
+                    moves = bot.generatingPossibleMoves(state, n_player)
+                for move_col, shape in moves:
+                    child = copy_state(state)
+                    if child.apply_move(n_player, shape, move_col) == -1:
+                        continue
+                    next_frontier[(zobrist.hash(child, 1 - n_player), book_player)] = (child, book_player)
+            frontier = next_frontier
+            print(f"ply {ply}: searched {len(to_search)} positions in {time() - start:.1f}s, book has {len(entries)}")
+
+    OpeningBook.write(path, row, col, entries)
+    return len(entries)
+
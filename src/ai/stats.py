@@ -0,0 +1,66 @@
+from typing import Dict, List
+
+
+class SearchStats:
+    """
+    Class for counters of one find call of a bot, read from bot.stats after find returns.
+    Counters are plain integers and floats updated by the search itself, so they stay on.
+
+    [ATTRIBUTES]
+        source: str -> where the move comes from: search, ponder, book, endgame or random
+        nodes: int -> number of visited positions (annealing iterations for local search)
+        leaves: int -> number of positions evaluated with the heuristic
+        cutoffs: int -> number of beta cutoffs
+        first_move_cutoffs: int -> number of beta cutoffs caused by the first move searched
+        timeouts: int -> number of iterations stopped by the thinking time
+        depth: int -> deepest completed iteration, number of empty tiles for the endgame solver
+        depth_times: List[float] -> seconds from the start of find to the end of every completed iteration
+        eval_time: float -> seconds spent evaluating leaves
+        total_time: float -> seconds spent in find
+    """
+
+    def __init__(self, source: str = "search"):
+        self.source = source
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.timeouts = 0
+        self.depth = 0
+        self.depth_times: List[float] = []
+        self.eval_time = 0.0
+        self.total_time = 0.0
+
+    @property
+    def eval_share(self) -> float:
+        """
+        [DESC]
+            Share of find time spent evaluating leaves, between 0 and 1
+        """
+        return self.eval_time / self.total_time if self.total_time else 0.0
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.total_time if self.total_time else 0.0
+
+    def report(self) -> Dict[str, object]:
+        """
+        [DESC]
+            Function to get every counter as a JSON serializable dictionary
+        [RETURN]
+            Dict -> every attribute with eval_share and nodes_per_sec
+        """
+        report = dict(vars(self))
+        report["depth_times"] = list(self.depth_times)
+        report["eval_share"] = self.eval_share
+        report["nodes_per_sec"] = self.nodes_per_sec
+        return report
+
+    def __str__(self):
+        times = ", ".join(f"{t:.3f}" for t in self.depth_times)
+        return (
+            f"{self.source}: depth {self.depth} in {self.total_time:.3f}s [{times}], "
+            f"{self.nodes} nodes ({self.nodes_per_sec:.0f}/s), {self.leaves} leaves, "
+            f"{self.cutoffs} cutoffs, {self.timeouts} timeouts, "
+            f"{self.eval_share * 100:.1f}% of time in evaluation"
+        )
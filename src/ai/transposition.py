@@ -0,0 +1,219 @@
+import random
+import sys
+from typing import Dict, List, Tuple
+
+from src.constant import ShapeConstant, GameConstant
+from src.model import State
+
+
+class ZobristHash:
+    """
+    Class for Zobrist keys of a board geometry. Key of a state is the xor of the random number of
+    every (cell, shape, color) on board, of every player remaining quota and of the player to move,
+    so applying or reverting a move only needs a few xor.
+
+    [ATTRIBUTES]
+        row: int -> boards row shape
+        col: int -> boards column shape
+        streak: int -> number of connected pieces needed to win, keys are the same for every
+            streak but tables of different streaks must not be mixed
+        piece_key: List[Dict[Tuple[str, str], int]] -> random number for every (shape, color) in a cell
+        quota_key: List[Dict[str, List[int]]] -> random number for every player, shape and quota count
+        turn_key: int -> random number xor-ed when player 2 is to move
+
+    [METHODS]
+        hash -> Compute key of a state from scratch
+        move_key -> Key difference caused by a move
+    """
+
+    def __init__(self, row: int, col: int, seed: int = 3170, streak: int = GameConstant.N_COMPONENT_STREAK):
+        rng = random.Random(seed)
+        max_quota = row * col
+        self.row = row
+        self.col = col
+        self.streak = streak
+        self.piece_key = [
+            {
+                (shape, color): rng.getrandbits(64)
+                for shape in [ShapeConstant.CROSS, ShapeConstant.CIRCLE]
+                for color in GameConstant.PLAYER_COLOR
+            }
+            for _ in range(row * col)
+        ]
+        self.quota_key = [
+            {
+                shape: [rng.getrandbits(64) for _ in range(max_quota + 1)]
+                for shape in [ShapeConstant.CROSS, ShapeConstant.CIRCLE]
+            }
+            for _ in range(2)
+        ]
+        self.turn_key = rng.getrandbits(64)
+
+    def hash(self, state: State, n_player: int) -> int:
+        """
+        [DESC]
+            Function to compute key of a state
+        [PARAMS]
+            state: State -> current state
+            n_player: int -> player to move
+        [RETURN]
+            int -> 64 bit key
+        """
+        key = 0
+        for row in range(self.row):
+            for col in range(self.col):
+                piece = state.board[row, col]
+                if piece.shape != ShapeConstant.BLANK:
+                    key ^= self.piece_key[row * self.col + col][piece.shape, piece.color]
+        for n, player in enumerate(state.players):
+            for shape, quota in player.quota.items():
+                key ^= self.quota_key[n][shape][int(quota)]
+        if n_player == 1:
+            key ^= self.turn_key
+        return key
+
+    def move_key(self, row: int, col: int, n_player: int, shape: str, quota: int) -> int:
+        """
+        [DESC]
+            Function to compute key difference when n_player place shape at row, col.
+            Xor it with the key before the move to get the key after the move and the other way
+        [PARAMS]
+            row: int -> row of the placed piece
+            col: int -> column of the placed piece
+            n_player: int -> player who place the piece
+            shape: str -> shape of the placed piece
+            quota: int -> player quota of shape after the move
+        [RETURN]
+            int -> key difference
+        """
+        quota = int(quota)
+        quota_key = self.quota_key[n_player][shape]
+        return (
+            self.piece_key[row * self.col + col][shape, GameConstant.PLAYER_COLOR[n_player]]
+            ^ quota_key[quota]
+            ^ quota_key[quota + 1]
+            ^ self.turn_key
+        )
+
+
+class TranspositionTable:
+    """
+    Class for fixed size transposition table. Every entry is a tuple
+    (key, depth, flag, score, move) stored in the slot key & (capacity - 1).
+
+    The table can be kept between searches. Every search started with new_search has a new age,
+    and every slot remembers the age of the search storing it. An entry is replaced when the slot
+    is empty, holds the same position, holds an entry of an older search, or holds a position
+    searched less deep than the new one (depth-preferred replacement). Entries more than max_age
+    searches old are not found by probe anymore.
+
+    [ATTRIBUTES]
+        capacity: int -> number of slot, power of two fitting in max_memory_mb
+        table: List[Tuple] -> the slots
+        ages: List[int] -> age of the search storing every slot
+        age: int -> age of the current search
+        max_age: int -> number of searches an entry is kept for after the one storing it
+        probes: int -> number of probe since last clear or new_search
+        hits: int -> number of probe finding its position since last clear or new_search
+        stores: int -> number of stored entry since last clear or new_search
+        used: int -> number of filled slot
+    """
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # Estimated size of one filled slot: list pointer, entry tuple, 64 bit key, float score and move tuple.
+    ENTRY_BYTES = (
+        8
+        + sys.getsizeof((0, 0, 0, 0.0, None))
+        + sys.getsizeof(2 ** 63)
+        + sys.getsizeof(0.0)
+        + sys.getsizeof((0, ShapeConstant.CROSS))
+    )
+
+    def __init__(self, max_memory_mb: float = 16, max_age: int = 0):
+        capacity = 1
+        while capacity * 2 * self.ENTRY_BYTES <= max_memory_mb * 1024 * 1024:
+            capacity *= 2
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.max_age = max_age
+        self.clear()
+
+    def clear(self):
+        self.table: List[Tuple] = [None] * self.capacity
+        self.ages: List[int] = [0] * self.capacity
+        self.age = 0
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """
+        [DESC]
+            Function to start a new search keeping the entries of the previous ones, entries of
+            older searches are replaced first
+        """
+        self.age += 1
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key: int) -> Tuple[int, int, int, float, Tuple[int, str]]:
+        """
+        [DESC]
+            Function to find entry of a position
+        [PARAMS]
+            key: int -> zobrist key of the position
+        [RETURN]
+            None if position is not in table
+            Tuple[key, depth, flag, score, move] if position is in table
+        """
+        self.probes += 1
+        index = key & self.mask
+        entry = self.table[index]
+        if entry is not None and entry[0] == key and self.age - self.ages[index] <= self.max_age:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: float, move: Tuple[int, str]):
+        """
+        [DESC]
+            Function to store search result of a position
+        [PARAMS]
+            key: int -> zobrist key of the position
+            depth: int -> remaining depth searched below the position
+            flag: int -> EXACT, LOWER (score is lower bound) or UPPER (score is upper bound)
+            score: float -> search score
+            move: Tuple[int, str] -> best move found, None for leaf
+        """
+        index = key & self.mask
+        entry = self.table[index]
+        if entry is None:
+            self.used += 1
+        elif entry[0] != key and entry[1] > depth and self.ages[index] == self.age:
+            return
+        self.table[index] = (key, depth, flag, score, move)
+        self.ages[index] = self.age
+        self.stores += 1
+
+    def report(self) -> Dict[str, float]:
+        """
+        [DESC]
+            Function to summarize table usage since last clear, probes, hits and stores are
+            counted since last new_search
+        [RETURN]
+            Dict -> probes, hits, hit_rate, stores, used, capacity and memory_mb
+        """
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "stores": self.stores,
+            "used": self.used,
+            "capacity": self.capacity,
+            "memory_mb": (sys.getsizeof(self.table) + sys.getsizeof(self.ages) + self.used * (self.ENTRY_BYTES - 8)) / (1024 * 1024),
+        }
@@ -38,4 +38,5 @@ class Path:
     PVB_FOLDER = "pvb"
     BVB_P1 = os.path.join(FOLDER, BVB_FOLDER, "{}")
     BVB_P2 = os.path.join(FOLDER, BVB_FOLDER, "{}")
-    PVB = os.path.join(FOLDER, PVB_FOLDER, "{}")
\ No newline at end of file
+    PVB = os.path.join(FOLDER, PVB_FOLDER, "{}")
+    OPENING_BOOK = os.path.join(FOLDER, "opening_book.bin")
\ No newline at end of file
@@ -1 +1,2 @@
+from src.mechanic.engine import Engine
 from src.mechanic.game import Game
\ No newline at end of file
@@ -0,0 +1,106 @@
+from typing import List, Tuple
+
+from src.constant import ShapeConstant, GameConstant
+from src.model import Board, Player, State, Config
+from src.utility import is_win, is_full, place, copy_state
+
+
+class Engine:
+    """
+    Class for headless game, the rules of Game.gameplay without any input or output. Moves are
+    (column, shape) tuples, the player to move is given by the round of the state.
+
+    [ATTRIBUTES]
+        state: State -> current state, shared with bots searching the game
+        outcome: int -> None while the game goes on, DRAW or the number of the winning player
+
+    [METHODS]
+        player -> Number of the player to move
+        legal_moves -> Every move the player to move can play
+        step -> Play a move of the player to move
+        result -> Outcome of the game, None while the game goes on
+        clone -> Independent copy of the game
+    """
+
+    DRAW = -1
+    SHAPES = [ShapeConstant.CROSS, ShapeConstant.CIRCLE]
+
+    def __init__(self, config: Config = None, state: State = None):
+        if state is None:
+            state = State(
+                Board(config.row, config.col, config.streak),
+                [
+                    Player(GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR, dict(config.quota[0])),
+                    Player(GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR, dict(config.quota[1])),
+                ],
+                1,
+            )
+        self.state = state
+        self.outcome = None
+
+    @property
+    def player(self) -> int:
+        return (self.state.round - 1) % 2
+
+    def legal_moves(self) -> List[Tuple[int, str]]:
+        """
+        [DESC]
+            Function to list every move of the player to move, empty when the game is over
+        [RETURN]
+            List[Tuple[int, str]] -> (column, shape) of every move
+        """
+        if self.outcome is not None:
+            return []
+        quota = self.state.players[self.player].quota
+        shapes = [shape for shape in self.SHAPES if quota[shape] > 0]
+        board = self.state.board
+        return [(col, shape) for col in range(board.col) if board.heights[col] < board.row for shape in shapes]
+
+    def step(self, move: Tuple[int, str]) -> int:
+        """
+        [DESC]
+            Function to play a move of the player to move and go to next round
+        [PARAMS]
+            move: Tuple[int, str] -> (column, shape)
+        [RETURN]
+            -1 if the move is invalid or the game is over, nothing is changed
+            int(row) where the piece is placed if the move is valid
+        """
+        col, shape = move
+        if self.outcome is not None or col not in range(self.state.board.col) or shape not in self.SHAPES:
+            return -1
+        player = self.player
+        row = place(self.state, player, shape, col)
+        if row == -1:
+            return -1
+        self.state.round += 1
+
+        winner = is_win(self.state.board, (row, col))
+        if winner:
+            for n, streak_player in enumerate(self.state.players):
+                if winner[0] == streak_player.shape and winner[1] == streak_player.color:
+                    self.outcome = n
+                    break
+        elif is_full(self.state.board):
+            self.outcome = self.DRAW
+        return row
+
+    def result(self) -> int:
+        """
+        [DESC]
+            Function to get the outcome of the game
+        [RETURN]
+            None if the game goes on
+            DRAW if the board is full without streak
+            int -> number of the winning player
+        """
+        return self.outcome
+
+    def clone(self) -> "Engine":
+        """
+        [DESC]
+            Function to copy the game, moves played on the copy do not change this game
+        """
+        engine = Engine(state=copy_state(self.state))
+        engine.outcome = self.outcome
+        return engine
@@ -2,50 +2,51 @@ import pickle
 from time import time
 
 from src.ai import *
-from src.model import Board, Player, State, Config
+from src.model import Config
 from src.constant import ShapeConstant, GameConstant, Path
-from src.utility import is_out, is_win, is_full, place
+from src.utility import is_out
+from src.mechanic.engine import Engine
+from src.mechanic.record import GameRecord, GameRecordWriter
 
 
 class Game:
     """
-    Class represetation for Main Game
+    Class represetation for Main Game, terminal front end of Engine
 
     [ATTRIBUTES]
         config: Config -> configuration used for gameplay
-        state: State -> current state in a round
+        engine: Engine -> rules of the game
+        state: State -> current state in a round, state of engine
         bot: List[Bot] -> bot used in pvb or bvb
+        record: GameRecord -> moves of the game, None if config.record is not set
 
     [METHODS]
         __gen_player -> Generate player, if is_dump == True, 
             it will take bot from bin folder based on game type in config 
+        __player_names -> Name of both players for the game record
         __input -> Input for player
         __is_valid -> Check if input is valid
         __placement -> Placement phase for player or bot
+        __report -> Print transposition table report and search stats of bot if available
+        __ponder -> Let bot think on the opponent's time if ponder is enabled in config
     """
     def __init__(self, config: Config):
         print(config)
         self.config = config
 
-        board = Board(config.row, config.col)
-        players = [
-            Player(
-                GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR, config.quota[0]
-            ),
-            Player(
-                GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR, config.quota[1]
-            ),
-        ]
-
         self.__gen_player()
-        self.state = State(board, players, 1)
+        self.engine = Engine(config)
+        self.state = self.engine.state
+        self.record = None
+        if config.record:
+            self.record = GameRecord(config.row, config.col, config.quota, self.__player_names(), config.thinking_time, config.streak)
 
     def __gen_player(self):
         if self.config.game_type == GameConstant.BVB:
             if not self.config.is_dump:
                 # You can change model used here
-                model1 = MinimaxGroup2()
-                model2 = MinimaxGroup2()
+                model1 = MinimaxGroup2(opening_book=self.config.opening_book)
+                model2 = MinimaxGroup2(opening_book=self.config.opening_book)
             else:
                 # Don't change this
                 model1 = pickle.load(open(Path.BVB_P1, "rb"))
@@ -56,7 +57,7 @@ class Game:
         elif self.config.game_type == GameConstant.PVB:
             if not self.config.is_dump:
                 # You can change model used here
-                model = MinimaxGroup2()
+                model = MinimaxGroup2(opening_book=self.config.opening_book)
             else:
                 # Don't change this
                 model = pickle.load(open(Path.PVB, "rb"))
@@ -68,6 +69,13 @@ class Game:
         else:
             self.bot = []
 
+    def __player_names(self):
+        names = []
+        for player in range(2):
+            bot = self.bot[player] if player < len(self.bot) else None
+            names.append("human" if bot is None else type(bot).__name__)
+        return names
+
     def __input(self):
         choosen_col = int(input("Put Column: "))
         choosen_shape = str(input("Put Shape: "))
@@ -78,8 +86,32 @@ class Game:
             return True
         return False
 
+    def __report(self, bot):
+        report = getattr(bot, "tt_report", None)
+        if report:
+            print(
+                f'Transposition: hit rate {report["hit_rate"] * 100:.1f}% '
+                f'({report["hits"]}/{report["probes"]}), memory {report["memory_mb"]:.2f} MB'
+            )
+        if hasattr(bot, "stats"):
+            print(f'Stats: {bot.stats}')
+        if self.config.ponder and hasattr(bot, "ponderReport"):
+            report = bot.ponderReport()
+            print(
+                f'Ponder: hit rate {report["hit_rate"] * 100:.1f}% '
+                f'({report["hits"]}/{report["hits"] + report["misses"]})'
+            )
+
+    def __ponder(self, player):
+        if not self.config.ponder:
+            return
+        bot = self.bot[player] if player < len(self.bot) else None
+        if bot is not None and hasattr(bot, "ponder"):
+            bot.ponder(self.state, player)
+
     def __placement(self, player):
-        player_turn = (self.state.round - 1) % 2
+        player_turn = self.engine.player
+        move_start = time()
 
         while True:
             if self.config.game_type == GameConstant.PVB:
@@ -91,6 +123,7 @@ class Game:
                         self.state, player_turn, self.config.thinking_time
                     )
                     print(f'Runtime: {time() - start}')
+                    self.__report(self.bot[player_turn])
 
             elif self.config.game_type == GameConstant.PVP:
                 choosen_col, choosen_shape = self.__input()
@@ -101,6 +134,7 @@ class Game:
                     self.state, player_turn, self.config.thinking_time
                 )
                 print(f'Runtime: {time() - start}')
+                self.__report(self.bot[player_turn])
 
             
             if self.__is_valid(choosen_col, choosen_shape):
@@ -108,12 +142,14 @@ class Game:
 
             print(f"{choosen_col} {choosen_shape} input are not valid")
 
-        placement = place(self.state, player, choosen_shape, choosen_col)
+        placement = self.engine.step((choosen_col, choosen_shape))
+        if placement != -1 and self.record is not None:
+            self.record.add_move(choosen_col, choosen_shape, time() - move_start)
         return placement
 
     def gameplay(self):
         while True:
-            player = (self.state.round - 1) % 2
+            player = self.engine.player
             print(f"Round {self.state.round}")
             print(self.state.board)
             print("\nShape Quota")
@@ -125,20 +161,29 @@ class Game:
                 print(self.state.board)
                 placement = self.__placement(player)
 
-            self.state.round += 1
-            winner = is_win(self.state.board)
-            if winner:
-                print(self.state.board)
+            result = self.engine.result()
+            if result is not None:
+                if result != Engine.DRAW:
+                    print(self.state.board)
                 break
-            if is_full(self.state.board):
-                break
-
-        if winner:
-            for i, player in enumerate(self.state.players):
-                if winner[0] == player.shape and winner[1] == player.color:
-                    print(
-                        f"Player {i + 1} with color {player.color} and shape {player.shape} Win"
-                    )
-                    break
+            self.__ponder(player)
+
+        for bot in self.bot:
+            if bot is not None and hasattr(bot, "stopPondering"):
+                bot.stopPondering()
+            if bot is not None and hasattr(bot, "close"):
+                bot.close()
+
+        if result != Engine.DRAW:
+            player = self.state.players[result]
+            if self.record is not None:
+                self.record.winner = result
+            print(
+                f"Player {result + 1} with color {player.color} and shape {player.shape} Win"
+            )
         else:
             print("DRAW")
+
+        if self.record is not None:
+            with GameRecordWriter(self.config.record) as writer:
+                writer.write(self.record)
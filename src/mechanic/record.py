@@ -0,0 +1,217 @@
+import os
+import struct
+from typing import BinaryIO, Iterator, List, Tuple
+
+from src.constant import ShapeConstant, GameConstant
+from src.model import Board, Player, State
+from src.utility import place
+
+
+class GameRecord:
+    """
+    Class for the record of one game: header then every move with the time used to choose it.
+
+    [ATTRIBUTES]
+        row: int -> boards row shape
+        col: int -> boards column shape
+        quota: List[Dict[str, int]] -> starting quota of every player, like Config.quota
+        bots: List[str] -> name of player 1 and player 2 (bot class or human)
+        thinking_time: float -> thinking time of bots
+        streak: int -> number of connected pieces needed to win
+        winner: int -> 0 or 1 for the winning player, None for a draw or an unfinished game
+        moves: List[Tuple[int, str]] -> (column, shape) of every move, player 1 first
+        times: List[float] -> seconds used for every move
+    """
+
+    def __init__(self, row: int, col: int, quota, bots: List[str], thinking_time: float, streak: int = GameConstant.N_COMPONENT_STREAK):
+        self.row = row
+        self.col = col
+        self.streak = streak
+        self.quota = [{shape: int(n) for shape, n in player_quota.items()} for player_quota in quota]
+        self.bots = list(bots)
+        self.thinking_time = thinking_time
+        self.winner = None
+        self.moves: List[Tuple[int, str]] = []
+        self.times: List[float] = []
+
+    def add_move(self, col: int, shape: str, seconds: float):
+        self.moves.append((col, shape))
+        self.times.append(seconds)
+
+    def replay(self) -> Iterator[State]:
+        """
+        [DESC]
+            Function to replay the game from the starting position
+        [RETURN]
+            Iterator[State] -> the same state after every move
+        """
+        players = [
+            Player(GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR, dict(self.quota[0])),
+            Player(GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR, dict(self.quota[1])),
+        ]
+        state = State(Board(self.row, self.col, self.streak), players, 1)
+        for col, shape in self.moves:
+            place(state, (state.round - 1) % 2, shape, col)
+            state.round += 1
+            yield state
+
+
+class GameRecordFormat:
+    """
+    Binary layout of a game record file, little endian. The file starts with the magic b"SPGR"
+    and a u16 version, then games follow each other until the end of file:
+        length u32: bytes of the game after this field, so a reader can skip it
+        header: row u8, col u8, quota u16 x 4 (player 1 cross, circle, player 2 cross, circle),
+            thinking_time f32, winner i8 (-1 if none), move count u16, name length u8 x 2,
+            streak u8
+        bot names: utf-8 bytes of player 1 then player 2
+        moves: one byte per move, column << 1 | shape (0 cross, 1 circle)
+        times: u16 per move, milliseconds, saturated at 65535
+    """
+
+    MAGIC = b"SPGR"
+    VERSION = 1
+    FILE_HEADER = struct.Struct("<4sH")
+    LENGTH = struct.Struct("<I")
+    HEADER = struct.Struct("<BBHHHHfbHBBB")
+    SHAPES = [ShapeConstant.CROSS, ShapeConstant.CIRCLE]
+    MAX_MILLIS = 65535
+
+
+class GameRecordWriter:
+    """
+    Class for append-only writer of game records. Every game is packed in memory and written
+    with one write call, so writing costs nothing while the game is played and a crash never
+    leaves half a game in the file.
+
+    [ATTRIBUTES]
+        file: BinaryIO -> file opened in append mode
+        count: int -> number of games written by this writer
+    """
+
+    def __init__(self, path: str, flush: bool = True):
+        self.file: BinaryIO = open(path, "ab")
+        self.flush = flush
+        self.count = 0
+        if self.file.tell() == 0:
+            self.file.write(GameRecordFormat.FILE_HEADER.pack(GameRecordFormat.MAGIC, GameRecordFormat.VERSION))
+
+    def write(self, record: GameRecord):
+        """
+        [DESC]
+            Function to append a finished game to the file
+        [PARAMS]
+            record: GameRecord -> game to write, at most 65535 moves and 128 columns
+        """
+        names = [name.encode("utf-8")[:255] for name in record.bots]
+        quota = [record.quota[n][shape] for n in range(2) for shape in GameRecordFormat.SHAPES]
+        winner = -1 if record.winner is None else record.winner
+        header = GameRecordFormat.HEADER.pack(
+            record.row, record.col, *quota, record.thinking_time, winner, len(record.moves), len(names[0]), len(names[1]), record.streak
+        )
+        moves = bytes(col << 1 | GameRecordFormat.SHAPES.index(shape) for col, shape in record.moves)
+        millis = [min(int(seconds * 1000 + 0.5), GameRecordFormat.MAX_MILLIS) for seconds in record.times]
+        times = struct.pack(f"<{len(millis)}H", *millis)
+
+        body = header + names[0] + names[1] + moves + times
+        self.file.write(GameRecordFormat.LENGTH.pack(len(body)) + body)
+        if self.flush:
+            self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class GameRecordReader:
+    """
+    Class for lazy reader of game records. Games are read one at a time while iterating, so
+    files of any size can be read with constant memory.
+
+    [ATTRIBUTES]
+        path: str -> game record file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        with open(self.path, "rb") as f:
+            for body in self.bodies(f):
+                yield self.parse(body)
+
+    def count(self) -> int:
+        """
+        [DESC]
+            Function to count games in the file, skipping over them without parsing
+        """
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.read_file_header(f)
+            count = 0
+            while True:
+                length = f.read(GameRecordFormat.LENGTH.size)
+                if len(length) < GameRecordFormat.LENGTH.size:
+                    return count
+                end = f.seek(GameRecordFormat.LENGTH.unpack(length)[0], 1)
+                # A game cut by the end of file is ignored, like bodies.
+                if end > size:
+                    return count
+                count += 1
+
+    def read_file_header(self, f: BinaryIO):
+        data = f.read(GameRecordFormat.FILE_HEADER.size)
+        if len(data) < GameRecordFormat.FILE_HEADER.size:
+            raise ValueError(f"{self.path} is not a game record file")
+        magic, version = GameRecordFormat.FILE_HEADER.unpack(data)
+        if magic != GameRecordFormat.MAGIC or version != GameRecordFormat.VERSION:
+            raise ValueError(f"{self.path} is not a game record file")
+
+    def bodies(self, f: BinaryIO) -> Iterator[bytes]:
+        """
+        [DESC]
+            Function to read the bytes of every game, a game cut by the end of file is ignored
+        """
+        self.read_file_header(f)
+        while True:
+            length = f.read(GameRecordFormat.LENGTH.size)
+            if len(length) < GameRecordFormat.LENGTH.size:
+                return
+            size = GameRecordFormat.LENGTH.unpack(length)[0]
+            body = f.read(size)
+            if len(body) < size:
+                return
+            yield body
+
+    @staticmethod
+    def parse(body: bytes) -> GameRecord:
+        """
+        [DESC]
+            Function to unpack the bytes of one game
+        [RETURN]
+            GameRecord of the game
+        """
+        row, col, q1x, q1o, q2x, q2o, thinking_time, winner, n_move, len1, len2, streak = GameRecordFormat.HEADER.unpack_from(body)
+        offset = GameRecordFormat.HEADER.size
+        bot1 = body[offset:offset + len1].decode("utf-8")
+        offset += len1
+        bot2 = body[offset:offset + len2].decode("utf-8")
+        offset += len2
+        quota = [
+            {ShapeConstant.CROSS: q1x, ShapeConstant.CIRCLE: q1o},
+            {ShapeConstant.CROSS: q2x, ShapeConstant.CIRCLE: q2o},
+        ]
+
+        record = GameRecord(row, col, quota, [bot1, bot2], thinking_time, streak)
+        record.winner = None if winner == -1 else winner
+        shapes = GameRecordFormat.SHAPES
+        record.moves = [(move >> 1, shapes[move & 1]) for move in body[offset:offset + n_move]]
+        offset += n_move
+        record.times = [millis / 1000 for millis in struct.unpack_from(f"<{n_move}H", body, offset)]
+        return record
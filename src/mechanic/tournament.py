@@ -0,0 +1,196 @@
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import permutations
+from time import time
+from typing import Dict, List, Tuple
+
+import src.ai
+from src.constant import GameConstant
+from src.model import Config
+from src.mechanic.engine import Engine
+from src.mechanic.record import GameRecord, GameRecordWriter
+
+
+def play_game(task: Dict[str, object]) -> Dict[str, object]:
+    """
+    [DESC]
+        Function to play one bot vs bot game on an Engine without printing anything. A bot
+        giving an invalid move or raising an exception loses the game
+    [PARAMS]
+        task: Dict -> game id, bots (class names of src.ai, player 1 first), row, col,
+            streak, thinking_time and seed
+    [RETURN]
+        Dict -> task with winner (0 or 1, None for a draw), reason, number of moves, game
+        duration, time used by every player and the GameRecord of the game
+    """
+    random.seed(task["seed"])
+    row, col = task["row"], task["col"]
+    config = Config(row, col, GameConstant.BVB, None, False, task["thinking_time"], streak=task["streak"])
+    engine = Engine(config)
+    bots = [getattr(src.ai, name)() for name in task["bots"]]
+    record = GameRecord(row, col, config.quota, task["bots"], task["thinking_time"], task["streak"])
+
+    start = time()
+    used = [0.0, 0.0]
+    winner = None
+    reason = "draw"
+    while engine.result() is None:
+        player = engine.player
+        move_start = time()
+        try:
+            col_move, shape = bots[player].find(engine.state, player, task["thinking_time"])
+        except Exception as error:
+            winner, reason = 1 - player, f"error: {type(error).__name__}: {error}"
+            break
+        finally:
+            move_time = time() - move_start
+            used[player] += move_time
+
+        if engine.step((col_move, shape)) == -1:
+            winner, reason = 1 - player, f"invalid move: {col_move} {shape}"
+            break
+        record.add_move(col_move, shape, move_time)
+
+    if engine.result() not in (None, Engine.DRAW):
+        winner, reason = engine.result(), "streak"
+
+    for bot in bots:
+        if hasattr(bot, "close"):
+            bot.close()
+
+    record.winner = winner
+    result = dict(task)
+    result.update({
+        "winner": winner,
+        "reason": reason,
+        "moves": len(record.moves),
+        "duration": time() - start,
+        "thinking": used,
+        "record": record,
+    })
+    return result
+
+
+def schedule(
+    bots: List[str],
+    boards: List[Tuple[int, int]],
+    thinking_times: List[float],
+    games: int,
+    alternate: bool = True,
+    seed: int = 0,
+    streak: int = GameConstant.N_COMPONENT_STREAK,
+) -> List[Dict[str, object]]:
+    """
+    [DESC]
+        Function to list games of a round robin tournament. Every pair of different bots plays
+        games games on every board and thinking time. With one bot, the bot plays itself
+    [PARAMS]
+        bots: List[str] -> class names of src.ai
+        boards: List[Tuple[int, int]] -> (row, col) of every board
+        thinking_times: List[float] -> thinking time of every setting
+        games: int -> number of games of every pair and setting
+        alternate: bool -> swap player 1 and player 2 every other game, else the first bot of
+            the pair is always player 1
+        seed: int -> seed of the first game, every game gets the next one
+        streak: int -> number of connected pieces needed to win in every game
+    [RETURN]
+        List[Dict] -> task of every game, to be played with play_game
+    """
+    pairs = list(permutations(bots, 2)) if len(bots) > 1 else [(bots[0], bots[0])]
+    # Both orders of a pair already swap colors when alternating.
+    if alternate:
+        pairs = [pair for pair in pairs if bots.index(pair[0]) <= bots.index(pair[1])]
+
+    tasks = []
+    for bot1, bot2 in pairs:
+        for row, col in boards:
+            for thinking_time in thinking_times:
+                for game in range(games):
+                    swap = alternate and game % 2 == 1
+                    tasks.append({
+                        "id": len(tasks),
+                        "bots": [bot2, bot1] if swap else [bot1, bot2],
+                        "row": row,
+                        "col": col,
+                        "streak": streak,
+                        "thinking_time": thinking_time,
+                        "seed": seed + len(tasks),
+                    })
+    return tasks
+
+
+def run(tasks: List[Dict[str, object]], output: str, workers: int = None, progress: float = 5, record: str = None) -> Dict[str, List[int]]:
+    """
+    [DESC]
+        Function to play every game in a process pool, writing every result as one JSON line
+        as soon as it is done. Nothing is printed by the games, progress is printed every
+        progress seconds
+    [PARAMS]
+        tasks: List[Dict] -> games as returned by schedule
+        output: str -> JSON lines file
+        workers: int -> number of processes, every core if None
+        progress: float -> seconds between progress lines
+        record: str -> game record file every game is appended to, None to not record
+    [RETURN]
+        Dict[str, List[int]] -> [win, draw, loss] of every bot, see standings
+    """
+    results = []
+    start = time()
+    last_print = start
+    writer = GameRecordWriter(record, flush=False) if record else None
+    with open(output, "w") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_game, task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            game_record = result.pop("record")
+            if writer is not None:
+                writer.write(game_record)
+            results.append(result)
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            if time() - last_print >= progress:
+                last_print = time()
+                elapsed = last_print - start
+                print(f"{len(results)}/{len(tasks)} games, {len(results) / elapsed:.2f} games/sec")
+
+    if writer is not None:
+        writer.close()
+    elapsed = time() - start
+    print(f"{len(results)} games in {elapsed:.1f}s, {len(results) / elapsed if elapsed else 0:.2f} games/sec")
+    return standings(results)
+
+
+def standings(results: List[Dict[str, object]]) -> Dict[str, List[int]]:
+    """
+    [DESC]
+        Function to print win/draw/loss tables of the results, one table for every bot overall
+        and one for every setting
+    [RETURN]
+        Dict[str, List[int]] -> [win, draw, loss] of every bot
+    """
+    total: Dict[str, List[int]] = {}
+    setting: Dict[Tuple[int, int, float, str, str], List[int]] = {}
+    for result in results:
+        for player, name in enumerate(result["bots"]):
+            opponent = result["bots"][1 - player]
+            if result["winner"] is None:
+                column = 1
+            else:
+                column = 0 if result["winner"] == player else 2
+            total.setdefault(name, [0, 0, 0])[column] += 1
+            key = (result["row"], result["col"], result["thinking_time"], name, opponent)
+            setting.setdefault(key, [0, 0, 0])[column] += 1
+            # Self play counts every game once.
+            if name == opponent:
+                break
+
+    print(f"\n{'bot':<24}{'win':>8}{'draw':>8}{'loss':>8}")
+    for name, (win, draw, loss) in sorted(total.items()):
+        print(f"{name:<24}{win:>8}{draw:>8}{loss:>8}")
+
+    print(f"\n{'board':<8}{'time':>8}  {'bot':<24}{'opponent':<24}{'win':>8}{'draw':>8}{'loss':>8}")
+    for (row, col, thinking_time, name, opponent), (win, draw, loss) in sorted(setting.items()):
+        board = f"{row}x{col}"
+        print(f"{board:<8}{thinking_time:>8}  {name:<24}{opponent:<24}{win:>8}{draw:>8}{loss:>8}")
+    return total
@@ -1,5 +1,7 @@
 from src.model.board import Board
+from src.model.bitboard import BitBoard
 from src.model.piece import Piece
 from src.model.player import Player
 from src.model.state import State
-from src.model.config import Config
\ No newline at end of file
+from src.model.config import Config
+from src.model.window_index import WindowIndex
\ No newline at end of file
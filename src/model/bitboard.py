@@ -0,0 +1,156 @@
+from typing import List, Tuple
+
+from src.constant import ColorConstant, ShapeConstant, GameConstant
+from src.model.board import Board
+from src.model.piece import Piece
+
+
+class BitBoard:
+    """
+    Class representation for Board stored as integer bitmasks
+
+    Every cell is mapped to one bit. Cells are laid out column by column from the bottom row
+    upward, and every column gets one extra sentinel bit on top so that shifting a mask never
+    carries a streak from one column into the next one. Piece codes are also kept in a flat
+    bytearray so reading a cell does not decode the masks.
+
+    [ATTRIBUTES]
+        row: int -> boards row shape
+        col: int -> boards column shape
+        streak: int -> number of connected pieces needed to win
+        height: int -> number of bits used by one column (row + 1 sentinel bit)
+        shape_mask: Dict[str, int] -> mask of cells filled with each shape
+        color_mask: Dict[str, int] -> mask of cells filled with each color
+        occupied: int -> mask of every filled cell
+        codes: bytearray -> code of every piece, same layout as Board.codes
+        heights: List[int] -> number of pieces in every column, same as Board.heights
+        filled: int -> number of pieces on the board
+
+    [METHODS]
+        from_board -> Build BitBoard from Board
+        to_board -> Build Board from BitBoard
+        winner -> Check streak with shift-and-AND on every mask
+    """
+
+    def __init__(self, row: int, col: int, streak: int = GameConstant.N_COMPONENT_STREAK):
+        self.row = row
+        self.col = col
+        self.streak = streak
+        self.height = row + 1
+        self.shape_mask = {ShapeConstant.CROSS: 0, ShapeConstant.CIRCLE: 0}
+        self.color_mask = {ColorConstant.RED: 0, ColorConstant.BLUE: 0}
+        self.occupied = 0
+        self.codes = bytearray(row * col)
+        self.heights: List[int] = [0] * col
+        self.filled = 0
+
+    @classmethod
+    def from_board(cls, board: Board) -> "BitBoard":
+        bitboard = cls(board.row, board.col, board.streak)
+        for row in range(board.row):
+            for col in range(board.col):
+                piece = board[row, col]
+                if piece.shape != ShapeConstant.BLANK:
+                    bitboard.set_piece(row, col, piece)
+        return bitboard
+
+    def to_board(self) -> Board:
+        board = Board(self.row, self.col, self.streak)
+        board.codes = bytearray(self.codes)
+        board.heights = list(self.heights)
+        board.filled = self.filled
+        return board
+
+    def __str__(self):
+        return self.to_board().__str__()
+
+    def bit(self, row: int, col: int) -> int:
+        return 1 << (col * self.height + self.row - 1 - row)
+
+    def __getitem__(self, pos: Tuple[int, int]):
+        row, col = pos
+        return Piece.BY_CODE[self.codes[row * self.col + col]]
+
+    def set_piece(self, row: int, col: int, piece: Piece):
+        bit = self.bit(row, col)
+        for key in self.shape_mask:
+            self.shape_mask[key] &= ~bit
+        for key in self.color_mask:
+            self.color_mask[key] &= ~bit
+        self.occupied &= ~bit
+
+        if piece.shape != ShapeConstant.BLANK:
+            self.shape_mask[piece.shape] |= bit
+            self.color_mask[piece.color] |= bit
+            self.occupied |= bit
+
+        cell = row * self.col + col
+        was_blank = self.codes[cell] == Piece.BLANK
+        self.codes[cell] = piece.code
+        if was_blank != (piece.code == Piece.BLANK):
+            step = 1 if was_blank else -1
+            self.heights[col] += step
+            self.filled += step
+
+    def drop_row(self, col: int) -> int:
+        return self.row - 1 - self.heights[col]
+
+    def has_streak(self, mask: int) -> bool:
+        """
+        [DESC]
+            Function to check if mask contains streak consecutive bits in any of
+            vertical, horizontal or both diagonal directions
+        [PARAMS]
+            mask: int -> mask to be checked
+        [RETURN]
+            True if streak found
+            False if there is no streak
+        """
+        for shift in (1, self.height, self.height + 1, self.height - 1):
+            streak = mask
+            for _ in range(self.streak - 1):
+                streak &= streak >> shift
+                if not streak:
+                    break
+            if streak:
+                return True
+        return False
+
+    def is_full(self) -> bool:
+        return self.filled == self.row * self.col
+
+    def winner(self, last_move: Tuple[int, int] = None) -> Tuple[str, str]:
+        """
+        [DESC]
+            Function to check if player won, shape streak is checked before color streak
+            following GameConstant.WIN_PRIOR
+        [PARAMS]
+            last_move: Tuple[int, int] -> (row, col) of the last placed piece. If given, only
+                the masks containing that piece are checked
+        [RETURN]
+            None if there is no streak
+            Tuple[shape, color] match with player set if there is a streak
+        """
+        player_set = [
+            (GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR),
+            (GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR),
+        ]
+        if last_move is not None:
+            piece = self[last_move]
+            if piece.shape == ShapeConstant.BLANK:
+                return None
+
+        for prior in GameConstant.WIN_PRIOR:
+            for player in player_set:
+                if last_move is not None:
+                    if prior == GameConstant.SHAPE and player[0] != piece.shape:
+                        continue
+                    if prior == GameConstant.COLOR and player[1] != piece.color:
+                        continue
+                if prior == GameConstant.SHAPE:
+                    mask = self.shape_mask[player[0]]
+                else:
+                    mask = self.color_mask[player[1]]
+                if self.has_streak(mask):
+                    return player
+        return None
@@ -1,5 +1,5 @@
-from typing import Tuple
-from src.constant import ColorConstant, ShapeConstant
+from typing import List, Tuple
+from src.constant import GameConstant
 from src.model.piece import Piece
 
 
@@ -10,16 +10,25 @@ class Board:
     [ATTRIBUTES]
         row: int -> boards row shape
         col: int -> boards column shape
-        board: 2D List -> board representation
+        streak: int -> number of connected pieces needed to win
+        codes: bytearray -> board representation, code of the piece at (row, col) is
+            codes[row * self.col + col], see Piece.code. Copying a board only copies these bytes
+        heights: List[int] -> number of pieces in every column, kept by set_piece
+        filled: int -> number of pieces on the board, kept by set_piece
+
+    [METHODS]
+        drop_row -> Row a piece dropped in a column lands on
+        is_full -> Check if every cell is filled
+        copy -> Independent copy of the board
     """
 
-    def __init__(self, row: int, col: int):
+    def __init__(self, row: int, col: int, streak: int = GameConstant.N_COMPONENT_STREAK):
         self.row = row
         self.col = col
-        self.board = [
-            [Piece(ShapeConstant.BLANK, ColorConstant.BLACK) for i in range(self.col)]
-            for j in range(self.row)
-        ]
+        self.streak = streak
+        self.codes = bytearray(self.row * self.col)
+        self.heights: List[int] = [0] * self.col
+        self.filled = 0
 
     def __str__(self):
         ret = ""
@@ -53,7 +62,7 @@ class Board:
                     elif col % 6 in [1, 2, 4, 5]:
                         ret += ' '
                     elif col % 6 == 3:
-                        ret += self.board[el_row][el_col].__str__()
+                        ret += Piece.BY_CODE[self.codes[el_row * self.col + el_col]].__str__()
                         el_col += 1
                 el_row += 1
                 el_col = 0
@@ -62,7 +71,39 @@ class Board:
 
     def __getitem__(self, pos: Tuple[int, int]):
         row, col = pos
-        return self.board[row][col]
+        return Piece.BY_CODE[self.codes[row * self.col + col]]
 
     def set_piece(self, row: int, col: int, piece: Piece):
-        self.board[row][col] = piece
+        cell = row * self.col + col
+        was_blank = self.codes[cell] == Piece.BLANK
+        self.codes[cell] = piece.code
+        # Pieces stack from the bottom, so filling or clearing a cell moves the column top.
+        if was_blank != (piece.code == Piece.BLANK):
+            step = 1 if was_blank else -1
+            self.heights[col] += step
+            self.filled += step
+
+    def drop_row(self, col: int) -> int:
+        """
+        [DESC]
+            Function to get the row a piece dropped in col lands on
+        [PARAMS]
+            col: int -> column of the piece
+        [RETURN]
+            -1 if the column is full
+            int(row) of the lowest blank cell of the column
+        """
+        return self.row - 1 - self.heights[col]
+
+    def is_full(self) -> bool:
+        return self.filled == self.row * self.col
+
+    def copy(self) -> "Board":
+        board = Board.__new__(Board)
+        board.row = self.row
+        board.col = self.col
+        board.streak = self.streak
+        board.codes = bytearray(self.codes)
+        board.heights = list(self.heights)
+        board.filled = self.filled
+        return board
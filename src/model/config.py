@@ -1,4 +1,4 @@
-from src.constant import ShapeConstant
+from src.constant import ShapeConstant, GameConstant
 
 
 class Config:
@@ -13,6 +13,10 @@ class Config:
         player_choice: int -> Could be 0 or 1 (only needed for player vs bot)
         thinking_time: float -> Maximal time for bot to think (only needed for player vs bot or bot vs bot)
         is_dump: bool -> is model loaded from bin file
+        ponder: bool -> bots keep searching while their opponent thinks (only needed for player vs bot or bot vs bot)
+        record: str -> game record file the game is appended to, None to not record
+        streak: int -> number of connected pieces needed to win
+        opening_book: str -> opening book file of MinimaxGroup2 bots, None to always search
     """
 
     def __init__(
@@ -23,6 +27,10 @@ class Config:
         player_choice: int,
         is_dump: bool,
         thinking_time: float,
+        ponder: bool = False,
+        record: str = None,
+        streak: int = GameConstant.N_COMPONENT_STREAK,
+        opening_book: str = None,
     ):
         self.row = row
         self.col = col
@@ -46,6 +54,10 @@ class Config:
             self.player_choice = -1
 
         self.thinking_time = thinking_time
+        self.ponder = ponder
+        self.record = record
+        self.streak = streak
+        self.opening_book = opening_book
 
     def __str__(self):
         ret = '[Configuration]\n'
@@ -55,4 +67,8 @@ class Config:
         ret += f'game_type: {self.game_type}\n'
         ret += f'player_choice: {self.player_choice}\n'
         ret += f'thinking_time: {self.thinking_time}\n'
+        ret += f'ponder: {self.ponder}\n'
+        ret += f'record: {self.record}\n'
+        ret += f'streak: {self.streak}\n'
+        ret += f'opening_book: {self.opening_book}\n'
         return ret
\ No newline at end of file
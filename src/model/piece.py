@@ -1,20 +1,65 @@
+from typing import Dict, List, Tuple
+
 from clint.textui import colored
 
-from src.constant import ColorConstant
+from src.constant import ColorConstant, ShapeConstant
 
 
 class Piece:
     """
     Class representation for Piece inside Board
 
+    Pieces are flyweights: there is one Piece for every (shape, color), Piece(shape, color)
+    returns that shared Piece, so placing a piece never allocates and pieces are compared by
+    identity. Every piece has a small int code, boards store codes instead of pieces.
+
     [ATTRIBUTES]
         shape: str -> Shape piece inside board
         color: str -> Color piece inside board
+        code: int -> index of the piece in BY_CODE, SHAPE and COLOR. The blank piece is 0
+
+    [CLASS ATTRIBUTES]
+        BY_CODE: List[Piece] -> piece of every code
+        SHAPE: Tuple[str, ...] -> shape of every code
+        COLOR: Tuple[str, ...] -> color of every code
+        BLANK: int -> code of the blank piece (BLANK, BLACK)
     """
 
-    def __init__(self, shape: str, color: str):
-        self.shape = shape
-        self.color = color
+    __slots__ = ("shape", "color", "code")
+
+    SHAPE: Tuple[str, ...] = ()
+    COLOR: Tuple[str, ...] = ()
+    BLANK = 0
+    BY_CODE: List["Piece"] = []
+    _interned: Dict[Tuple[str, str], "Piece"] = {}
+
+    def __new__(cls, shape: str, color: str):
+        piece = cls._interned.get((shape, color))
+        if piece is None:
+            raise ValueError(f"Unknown piece {shape} {color}")
+        return piece
+
+    @classmethod
+    def _intern(cls, shape: str, color: str) -> "Piece":
+        piece = object.__new__(cls)
+        object.__setattr__(piece, "shape", shape)
+        object.__setattr__(piece, "color", color)
+        object.__setattr__(piece, "code", len(cls.BY_CODE))
+        cls.BY_CODE.append(piece)
+        cls._interned[shape, color] = piece
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Piece is shared between boards and cannot be changed")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Piece, (self.shape, self.color))
 
     def __str__(self):
         if self.color == ColorConstant.RED:
@@ -24,5 +69,20 @@ class Piece:
         elif self.color == ColorConstant.BLACK:
             return colored.green(self.shape)
 
+    def __repr__(self):
+        return f"Piece({self.shape!r}, {self.color!r})"
+
     def __eq__(self, o: object) -> bool:
-        return self.shape == o.shape and self.color == o.color
+        return self is o
+
+    def __hash__(self) -> int:
+        return self.code
+
+
+# Code is shape index * 3 + color index, so the blank piece (BLANK, BLACK) is code 0 and an
+# empty board is a bytearray of zeros.
+for _shape in (ShapeConstant.BLANK, ShapeConstant.CROSS, ShapeConstant.CIRCLE):
+    for _color in (ColorConstant.BLACK, ColorConstant.RED, ColorConstant.BLUE):
+        Piece._intern(_shape, _color)
+Piece.SHAPE = tuple(piece.shape for piece in Piece.BY_CODE)
+Piece.COLOR = tuple(piece.color for piece in Piece.BY_CODE)
@@ -1,7 +1,9 @@
+from src.constant import ColorConstant, ShapeConstant, GameConstant
 from src.model.board import Board
+from src.model.piece import Piece
 from src.model.player import Player
 
-from typing import List
+from typing import List, Tuple
 
 
 class State:
@@ -12,8 +14,66 @@ class State:
         board: Board -> current board in this state
         players: List[Player] -> list of players in game
         round: int -> Current round
+        history: List[Tuple[int, int, int, str]] -> (row, col, n_player, shape) of every move
+            applied with apply_move, used by undo_move
+
+    [METHODS]
+        last_move -> (row, col) of the last move done by apply_move
+        apply_move -> Place piece in board in place, same rule as utility.place
+        undo_move -> Revert the last move done by apply_move
     """
     def __init__(self, board: Board, players: List[Player], round: int):
         self.board = board
         self.players = players
         self.round = round
+        self.history: List[Tuple[int, int, int, str]] = []
+
+    @property
+    def last_move(self) -> Tuple[int, int]:
+        """
+        [DESC]
+            (row, col) of the last move done by apply_move, None if there is no such move
+        """
+        if not self.history:
+            return None
+        return self.history[-1][:2]
+
+    def apply_move(self, n_player: int, shape: str, col: int) -> int:
+        """
+        [DESC]
+            Function to place piece in board, decrease the player quota and go to next round.
+            Unlike utility.place, the move is recorded so it can be reverted with undo_move
+        [PARAMS]
+            n_player: int -> which player (player 1 or 2)
+            shape: str -> shape
+            col: int -> which col
+        [RETURN]
+            -1 if placement is invalid, nothing is changed
+            int(row) if placement is valid
+        """
+        if self.players[n_player].quota[shape] == 0:
+            return -1
+
+        row = self.board.drop_row(col)
+        if row == -1:
+            return -1
+        self.board.set_piece(row, col, Piece(shape, GameConstant.PLAYER_COLOR[n_player]))
+        self.players[n_player].quota[shape] -= 1
+        self.round += 1
+        self.history.append((row, col, n_player, shape))
+        return row
+
+    def undo_move(self) -> Tuple[int, int, int, str]:
+        """
+        [DESC]
+            Function to revert the last move done by apply_move, board, quota and round
+            are restored exactly
+        [RETURN]
+            Tuple[row, col, n_player, shape] of the reverted move
+        """
+        move = self.history.pop()
+        row, col, n_player, shape = move
+        self.board.set_piece(row, col, Piece(ShapeConstant.BLANK, ColorConstant.BLACK))
+        self.players[n_player].quota[shape] += 1
+        self.round -= 1
+        return move
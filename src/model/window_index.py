@@ -0,0 +1,65 @@
+from typing import Dict, List, Tuple
+
+
+class WindowIndex:
+    """
+    Class representation for precomputed lines of a board geometry. Cells are addressed with flat
+    index row * self.col + column, the same index used by Board.codes.
+
+    [ATTRIBUTES]
+        row: int -> boards row shape
+        col: int -> boards column shape
+        length: int -> number of cells in a window
+        ray: List[List[Tuple[int, ...]]] -> ray[cell][direction] is every cell after cell going to
+            direction until the edge of the board
+        start: List[List[Tuple[int, ...]]] -> start[cell][direction] is the window of length cells
+            beginning at cell going to direction, None if it does not fit in the board
+        windows: List[Tuple[int, ...]] -> every window of length cells on vertical, horizontal and
+            diagonal lines, each counted once
+        through: List[List[Tuple[int, ...]]] -> through[cell] is every window containing cell
+    """
+
+    directions: List[Tuple[int, int]] = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    direction_id: Dict[Tuple[int, int], int] = {direction: i for i, direction in enumerate(directions)}
+    # Direction id of (-row_ax, -col_ax) for every direction id.
+    opposite: List[int] = [1, 0, 3, 2, 7, 6, 5, 4]
+    # One direction of every line, windows are listed along these only.
+    line_directions: List[Tuple[int, int]] = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+    def __init__(self, row: int, col: int, length: int):
+        self.row = row
+        self.col = col
+        self.length = length
+
+        self.ray = []
+        for r in range(row):
+            for c in range(col):
+                rays = []
+                for row_ax, col_ax in self.directions:
+                    ray = []
+                    row_ = r + row_ax
+                    col_ = c + col_ax
+                    while 0 <= row_ < row and 0 <= col_ < col:
+                        ray.append(row_ * col + col_)
+                        row_ += row_ax
+                        col_ += col_ax
+                    rays.append(tuple(ray))
+                self.ray.append(rays)
+
+        self.start = [
+            [
+                (cell,) + rays[:length - 1] if len(rays) >= length - 1 else None
+                for rays in self.ray[cell]
+            ]
+            for cell in range(row * col)
+        ]
+
+        self.windows = []
+        self.through = [[] for _ in range(row * col)]
+        for cell in range(row * col):
+            for direction in self.line_directions:
+                window = self.start[cell][self.direction_id[direction]]
+                if window is not None:
+                    self.windows.append(window)
+                    for i in window:
+                        self.through[i].append(window)
@@ -1,7 +1,8 @@
 import pickle
-from typing import Tuple
+from functools import lru_cache
+from typing import List, Tuple
 
-from src.model import Piece, Board, State
+from src.model import Piece, Board, BitBoard, Player, State, WindowIndex
 from src.constant import ShapeConstant, GameConstant
 
 
@@ -40,11 +41,79 @@ def is_full(board: Board) -> bool:
         True if board is full
         False if board is not full
     """
-    for row in range(board.row):
-        for col in range(board.col):
-            if board[row, col].shape == ShapeConstant.BLANK:
-                return False
-    return True
+    return board.is_full()
+
+
+@lru_cache(maxsize=None)
+def get_window_index(row: int, col: int, length: int) -> WindowIndex:
+    """
+    [DESC]
+        Function to get precomputed lines of a board geometry, built once and cached
+    [PARAMS]
+        row: int -> num row board
+        col: int -> num column board
+        length: int -> number of cells in a window
+    [RETURN]
+        WindowIndex for the geometry
+    """
+    return WindowIndex(row, col, length)
+
+
+def check_window(codes: bytearray, window: Tuple[int, ...]) -> Tuple[str, Tuple[str, str]]:
+    """
+    [DESC]
+        Function to check if every piece in window has the same shape, or else the same color
+    [PARAMS]
+        codes: bytearray -> board piece codes
+        window: Tuple[int, ...] -> flat index of cells to be checked
+    [RETURN]
+        None if the window is not a streak
+        Tuple[prior, Tuple[shape, color]] match with player set if the window is a streak
+    """
+    piece = Piece.BY_CODE[codes[window[0]]]
+    if piece.shape == ShapeConstant.BLANK:
+        return None
+
+    player_set = [
+        (GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR),
+        (GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR),
+    ]
+    shape_of, color_of = Piece.SHAPE, Piece.COLOR
+    for prior in GameConstant.WIN_PRIOR:
+        if prior == GameConstant.SHAPE:
+            if any(shape_of[codes[i]] != piece.shape for i in window):
+                continue
+        elif any(color_of[codes[i]] != piece.color for i in window):
+            continue
+
+        for player in player_set:
+            if prior == GameConstant.SHAPE:
+                if piece.shape == player[0]:
+                    return (prior, player)
+
+            elif prior == GameConstant.COLOR:
+                if piece.color == player[1]:
+                    return (prior, player)
+    return None
+
+
+def _check_windows(codes: bytearray, windows: List[Tuple[int, ...]]) -> Tuple[str, Tuple[str, str]]:
+    """
+    [DESC]
+        Function to check windows, shape streak is returned before color streak
+    [RETURN]
+        None if there is no streak
+        Tuple[prior, Tuple[shape, color]] of the streak
+    """
+    temp_win = None
+    for window in windows:
+        checked = check_window(codes, window)
+        if checked:
+            if checked[0] == GameConstant.WIN_PRIOR[0]:
+                return checked
+            elif temp_win is None:
+                temp_win = checked
+    return temp_win
 
 
 def check_streak(board: Board, row: int, col: int) -> Tuple[str, str, str]:
@@ -59,73 +128,52 @@ def check_streak(board: Board, row: int, col: int) -> Tuple[str, str, str]:
         None if the row, col in a board isn't filled with piece
         Tuple[prior, shape, color] match with player set if streak found and cause of win
     """
-    piece = board[row, col]
-    if piece.shape == ShapeConstant.BLANK:
-        return None
+    index = get_window_index(board.row, board.col, board.streak)
+    windows = [window for window in index.start[row * board.col + col] if window is not None]
+    return _check_windows(board.codes, windows)
 
-    streak_way = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
 
-    for prior in GameConstant.WIN_PRIOR:
-        mark = 0
-        for row_ax, col_ax in streak_way:
-            row_ = row + row_ax
-            col_ = col + col_ax
-            for _ in range(GameConstant.N_COMPONENT_STREAK - 1):
-                if is_out(board, row_, col_):
-                    mark = 0
-                    break
-
-                shape_condition = (
-                    prior == GameConstant.SHAPE
-                    and piece.shape != board[row_, col_].shape
-                )
-                color_condition = (
-                    prior == GameConstant.COLOR
-                    and piece.color != board[row_, col_].color
-                )
-                if shape_condition or color_condition:
-                    mark = 0
-                    break
-
-                row_ += row_ax
-                col_ += col_ax
-                mark += 1
-
-            if mark == GameConstant.N_COMPONENT_STREAK - 1:
-                player_set = [
-                    (GameConstant.PLAYER1_SHAPE, GameConstant.PLAYER1_COLOR),
-                    (GameConstant.PLAYER2_SHAPE, GameConstant.PLAYER2_COLOR),
-                ]
-                for player in player_set:
-                    if prior == GameConstant.SHAPE:
-                        if piece.shape == player[0]:
-                            return (prior, player)
-                            
-                    elif prior == GameConstant.COLOR:
-                        if piece.color == player[1]:
-                            return (prior, player)
-
-
-def is_win(board: Board) -> Tuple[str, str]:
+def check_streak_through(board: Board, row: int, col: int) -> Tuple[str, str, str]:
+    """
+    [DESC]
+        Function to check streak on the 4 lines (vertical, horizontal and both diagonals)
+        passing through row, col in current board
+    [PARAMS]
+        board: Board -> current board
+        row: int -> row
+        col: int -> column
+    [RETURN]
+        None if the row, col in a board isn't filled with piece or there is no streak
+        Tuple[prior, shape, color] match with player set if streak found and cause of win
+    """
+    index = get_window_index(board.row, board.col, board.streak)
+    return _check_windows(board.codes, index.through[row * board.col + col])
+
+
+def is_win(board: Board, last_move: Tuple[int, int] = None) -> Tuple[str, str]:
     """
     [DESC]
         Function to check if player won
     [PARAMS]
         board: Board -> current board
+        last_move: Tuple[int, int] -> (row, col) of the last placed piece. If given, only the
+            lines through that piece are checked, so the board before that move must not
+            contain any streak
     [RETURN]
         None if there is no streak
         Tuple[shape, color] match with player set if there is a streak
     """
-    temp_win = None
-    for row in range(board.row):
-        for col in range(board.col):
-            checked = check_streak(board, row, col)
-            if checked:
-                if checked[0] == GameConstant.WIN_PRIOR[0]:
-                    return checked[1]
-                else:
-                    temp_win = checked[1]
-    return temp_win
+    if isinstance(board, BitBoard):
+        return board.winner(last_move)
+
+    if last_move is not None:
+        checked = check_streak_through(board, last_move[0], last_move[1])
+    else:
+        index = get_window_index(board.row, board.col, board.streak)
+        checked = _check_windows(board.codes, index.windows)
+    if checked:
+        return checked[1]
+    return None
 
 
 def place(state: State, n_player: int, shape: str, col: str) -> int:
@@ -144,11 +192,52 @@ def place(state: State, n_player: int, shape: str, col: str) -> int:
     if state.players[n_player].quota[shape] == 0:
         return -1
 
-    for row in range(state.board.row - 1, -1, -1):
-        if state.board[row, col].shape == ShapeConstant.BLANK:
-            piece = Piece(shape, GameConstant.PLAYER_COLOR[n_player])
-            state.board.set_piece(row, col, piece)
-            state.players[n_player].quota[shape] -= 1
-            return row
+    row = state.board.drop_row(col)
+    if row == -1:
+        return -1
+    state.board.set_piece(row, col, Piece(shape, GameConstant.PLAYER_COLOR[n_player]))
+    state.players[n_player].quota[shape] -= 1
+    return row
+
 
-    return -1
+def to_bitboard_state(state: State) -> State:
+    """
+    [DESC]
+        Function to convert state into state backed by BitBoard
+    [PARAMS]
+        state: State -> state backed by Board
+    [RETURN]
+        State backed by BitBoard, players are copied so the original state is left untouched
+    """
+    players = [Player(player.shape, player.color, dict(player.quota)) for player in state.players]
+    return State(BitBoard.from_board(state.board), players, state.round)
+
+
+def to_board_state(state: State) -> State:
+    """
+    [DESC]
+        Function to convert state backed by BitBoard into state backed by Board
+    [PARAMS]
+        state: State -> state backed by BitBoard
+    [RETURN]
+        State backed by Board, players are copied so the original state is left untouched
+    """
+    players = [Player(player.shape, player.color, dict(player.quota)) for player in state.players]
+    return State(state.board.to_board(), players, state.round)
+
+
+def copy_state(state: State) -> State:
+    """
+    [DESC]
+        Function to copy state, only the piece codes of the board are copied
+    [PARAMS]
+        state: State -> state backed by Board or BitBoard
+    [RETURN]
+        State with its own board and players, history is not copied
+    """
+    if isinstance(state.board, BitBoard):
+        board = BitBoard.from_board(state.board)
+    else:
+        board = state.board.copy()
+    players = [Player(player.shape, player.color, dict(player.quota)) for player in state.players]
+    return State(board, players, state.round)
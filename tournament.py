@@ -0,0 +1,33 @@
+import argparse
+import os
+
+from src.constant import GameConstant
+from src.mechanic.tournament import schedule, run
+
+
+def board_size(text: str):
+    row, col = text.lower().split("x")
+    if (int(row) * int(col)) % 2 != 0:
+        raise argparse.ArgumentTypeError(f"{text}: Row times Col is not even")
+    return (int(row), int(col))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--bots", nargs="+", default=["MinimaxGroup2", "LocalSearchGroup2"], help="class names of src.ai")
+    parser.add_argument("-s", "--boards", nargs="+", type=board_size, default=[(6, 7)], help="board sizes, like 6x7")
+    parser.add_argument("-k", "--streak", type=int, default=GameConstant.N_COMPONENT_STREAK, help="connected pieces needed to win")
+    parser.add_argument("-tt", "--thinking_time", nargs="+", type=float, default=[0.1], help="thinking times of bots")
+    parser.add_argument("-g", "--games", type=int, default=10, help="games of every pair of bots, board and thinking time")
+    parser.add_argument("--no_alternate", action="store_true", help="first bot of a pair is always player 1")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument("-o", "--output", default="tournament.jsonl", help="JSON lines file of game results")
+    parser.add_argument("-rec", "--record", help="game record file every game is appended to")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the first game")
+    args = parser.parse_args()
+    if args.streak < 3 or any(args.streak > max(row, col) for row, col in args.boards):
+        parser.error("streak must be at least 3 and fit in every board")
+
+    tasks = schedule(args.bots, args.boards, args.thinking_time, args.games, not args.no_alternate, args.seed, args.streak)
+    print(f"{len(tasks)} games on {args.workers} processes, results in {args.output}")
+    run(tasks, args.output, args.workers, record=args.record)